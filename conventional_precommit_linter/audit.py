@@ -0,0 +1,143 @@
+import argparse
+import math
+import random
+import subprocess
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import TypeVar
+
+from .batch import lint_commit_messages
+from .filters import compile_skip_filter
+from .filters import SkipFilter
+from .helpers import _color_green
+from .helpers import _color_red
+from .history import CommitRecord
+from .history import git_error_message
+from .history import iter_commit_records
+from .hook import DEFAULT_RULES_OUTPUT_STATUS
+from .hook import LintResult
+from .metrics import LintMetrics
+from .metrics import write_metrics_file
+
+T = TypeVar('T')
+
+Z_95 = 1.959964  # z-score of the 95% confidence level
+
+
+def reservoir_sample(items: Iterable[T], size: int, rng: random.Random) -> Tuple[List[T], int]:
+    """Select 'size' items uniformly at random from a stream of unknown length (Algorithm R).
+
+    Returns the sample (in stream order) and the total number of streamed items.
+    """
+    reservoir: List[Tuple[int, T]] = []
+    seen = 0
+    for seen, item in enumerate(items, 1):
+        if seen <= size:
+            reservoir.append((seen, item))
+            continue
+        slot = rng.randrange(seen)
+        if slot < size:
+            reservoir[slot] = (seen, item)
+    return [item for _, item in sorted(reservoir, key=lambda indexed: indexed[0])], seen
+
+
+def bernoulli_sample(items: Iterable[T], rate: float, rng: random.Random) -> Tuple[List[T], int]:
+    """Select each item of the stream independently with probability 'rate'.
+
+    Returns the sample (in stream order) and the total number of streamed items.
+    """
+    sample: List[T] = []
+    seen = 0
+    for seen, item in enumerate(items, 1):
+        if rng.random() < rate:
+            sample.append(item)
+    return sample, seen
+
+
+def wilson_interval(violations: int, sample_size: int, z: float = Z_95) -> Tuple[float, float]:
+    """Wilson score confidence interval of a violation rate (well behaved for rates close to 0 or 1)."""
+    if not sample_size:
+        return 0.0, 1.0
+    rate = violations / sample_size
+    denominator = 1 + z**2 / sample_size
+    center = (rate + z**2 / (2 * sample_size)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / sample_size + z**2 / (4 * sample_size**2)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def print_failed_commits(records: List[CommitRecord], results: List[LintResult]) -> None:
+    for record, result in zip(records, results):
+        if not result.failed:
+            continue
+        failed_rules = ', '.join(rule for rule, status in result.rules_output_status.items() if status)
+        message_title = record.message.strip().split('\n', 1)[0]
+        print(f'{_color_red("FAIL:")} {record.sha[:12]} {message_title} [{failed_rules}]')
+
+
+def print_sample_estimate(results: List[LintResult], total_commits: int, seed: int) -> None:
+    sample_size = len(results)
+    print(f'\nSampled {sample_size} of {total_commits} commits (seed {seed}), estimated violation rate per rule:')
+    print(f'    {"rule":<32}{"violations":>12}{"rate":>10}    95% confidence interval')
+    for rule in DEFAULT_RULES_OUTPUT_STATUS:
+        violations = sum(result.rules_output_status[rule] for result in results)
+        rate = violations / sample_size if sample_size else 0.0
+        low, high = wilson_interval(violations, sample_size)
+        print(f'    {rule:<32}{violations:>12}{rate:>10.1%}    [{low:.1%}, {high:.1%}]')
+
+
+def run_range_audit(args: argparse.Namespace) -> int:
+    """Lint the commits of a revision range, optionally only a reproducible random sample of them."""
+    records: Iterable[CommitRecord] = iter_commit_records([args.range])
+    skipped_commits = 0
+
+    def drop_skipped(records: Iterable[CommitRecord], skip_filter: SkipFilter) -> Iterator[CommitRecord]:
+        nonlocal skipped_commits
+        for record in records:
+            if skip_filter(record):
+                skipped_commits += 1
+                continue
+            yield record
+
+    # Skipped commits are dropped from the stream before sampling, title parsing and rule evaluation
+    skip_filter = compile_skip_filter(args)
+    if skip_filter:
+        records = drop_skipped(records, skip_filter)
+
+    rng = random.Random(args.sample_seed)
+
+    try:
+        if args.sample is not None:
+            sampled_records, total_commits = reservoir_sample(records, args.sample, rng)
+        elif args.sample_rate is not None:
+            sampled_records, total_commits = bernoulli_sample(records, args.sample_rate, rng)
+        else:
+            sampled_records = list(records)
+            total_commits = len(sampled_records)
+    except subprocess.CalledProcessError as error:
+        print(f'{_color_red(f"Can not list the commits of the range {args.range!r}:")} {git_error_message(error)}')
+        return 1
+
+    results = lint_commit_messages([record.message for record in sampled_records], args, strip_comments=False)
+    print_failed_commits(sampled_records, results)
+
+    if args.metrics_file:
+        metrics = LintMetrics()
+        for result in results:
+            metrics.observe_result(result)
+        write_metrics_file(args.metrics_file, metrics)
+
+    if args.sample is not None or args.sample_rate is not None:
+        print_sample_estimate(results, total_commits, args.sample_seed)
+
+    if skipped_commits:
+        print(f'\nSkipped {skipped_commits} commits matching the skip filters.')
+
+    failed_commits = sum(result.failed for result in results)
+    if failed_commits:
+        print(f'\n{_color_red(f"{failed_commits} of {len(results)} linted commits have an invalid commit message.")}')
+        return 1
+
+    print(_color_green(f'All {len(results)} linted commits have a valid commit message.'))
+    return 0
@@ -0,0 +1,41 @@
+import argparse
+import re
+from typing import Callable
+from typing import List
+from typing import Optional
+
+from .history import CommitRecord
+
+SkipFilter = Callable[[CommitRecord], bool]
+
+
+def compile_patterns(patterns: List[str]) -> 're.Pattern[str]':
+    """Compile a list of regex patterns into one alternation, so a field is searched only once."""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+def compile_skip_filter(args: argparse.Namespace) -> Optional[SkipFilter]:
+    """Build a single matcher of the raw commit records that should not be linted at all.
+
+    Only the configured filters are evaluated, cheapest first, before any title parsing.
+    Returns None if no skip filter is configured.
+    """
+    checks: List[SkipFilter] = []
+
+    if args.skip_merges:
+        checks.append(lambda record: len(record.parents) > 1)
+    if args.skip_author:
+        author_regex = compile_patterns(args.skip_author)
+        checks.append(lambda record: author_regex.search(record.author) is not None)
+    if args.skip_committer:
+        committer_regex = compile_patterns(args.skip_committer)
+        checks.append(lambda record: committer_regex.search(record.committer) is not None)
+    if args.skip_title:
+        title_regex = compile_patterns(args.skip_title)
+        checks.append(lambda record: title_regex.search(record.message.partition('\n')[0]) is not None)
+
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda record: any(check(record) for check in checks)
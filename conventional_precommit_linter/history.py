@@ -0,0 +1,99 @@
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import IO
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+FIELD_SEPARATOR = '\x1f'  # separates the fields of a commit record ('git log -z' separates the records by NUL)
+LOG_FORMAT = FIELD_SEPARATOR.join(('%H', '%P', '%an <%ae>', '%cn <%ce>', '%B'))
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class CommitRecord:
+    """Raw commit data as streamed from 'git log'."""
+
+    sha: str
+    parents: List[str]
+    author: str
+    committer: str
+    message: str
+
+
+def parse_commit_record(raw_record: str) -> CommitRecord:
+    sha, parents, author, committer, message = raw_record.split(FIELD_SEPARATOR, 4)
+    return CommitRecord(sha=sha, parents=parents.split(), author=author, committer=committer, message=message)
+
+
+def git_error_message(error: subprocess.CalledProcessError) -> str:
+    """Return the error output of a failed git command."""
+    stderr = error.stderr.decode('utf-8', errors='replace').strip() if error.stderr else ''
+    return stderr or f'git exited with code {error.returncode}'
+
+
+def iter_nul_separated(stream: IO[bytes]) -> Iterator[bytes]:
+    """Stream the NUL-separated records of a binary stream, reading it in large chunks."""
+    pending = b''
+    for chunk in iter(lambda: stream.read(READ_CHUNK_SIZE), b''):
+        *records, pending = (pending + chunk).split(b'\x00')
+        yield from records
+    if pending:
+        yield pending
+
+
+def iter_commit_records(
+    rev_args: List[str], cwd: Optional[str] = None, stdin_revisions: Optional[List[str]] = None, timeout: Optional[float] = None
+) -> Iterator[CommitRecord]:
+    """Stream commits selected by the 'git log' revision arguments without materializing the full history.
+
+    'stdin_revisions' are passed to 'git log --stdin' (any number of them, not limited by the command line length);
+    a '--not' among the 'rev_args' does not apply to them.
+
+    With a 'timeout' (seconds), git is killed once it is spent, also while git is still computing the walk before
+    the first commit is listed, and subprocess.TimeoutExpired is raised after the commits listed until then.
+    """
+    command = ['git', 'log', '-z', f'--format={LOG_FORMAT}', *rev_args]
+    if stdin_revisions is not None:
+        command.append('--stdin')
+    command.append('--')
+
+    with subprocess.Popen(command, cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+        assert process.stdin is not None and process.stdout is not None
+        killed = threading.Event()
+
+        def kill_git() -> None:
+            killed.set()
+            process.kill()
+
+        watchdog = threading.Timer(timeout, kill_git) if timeout is not None else None
+        if watchdog:
+            watchdog.daemon = True
+            watchdog.start()
+
+        try:
+            # git reads all the revisions before it starts the walk
+            process.stdin.write(''.join(f'{revision}\n' for revision in stdin_revisions or []).encode())
+            process.stdin.close()
+
+            # A record is only complete once the next one starts (or git exited normally), the last one read
+            # before git was killed may be cut off
+            last_record = None
+            for raw_record in iter_nul_separated(process.stdout):
+                if last_record is not None:
+                    yield parse_commit_record(last_record.decode('utf-8', errors='replace'))
+                last_record = raw_record
+
+            stderr = process.stderr.read() if process.stderr else b''
+            returncode = process.wait()
+        finally:
+            if watchdog:
+                watchdog.cancel()
+
+        if returncode != 0 and killed.is_set():
+            raise subprocess.TimeoutExpired(command, timeout or 0, stderr=stderr)
+        if last_record is not None:
+            yield parse_commit_record(last_record.decode('utf-8', errors='replace'))
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command, stderr=stderr)
@@ -1,7 +1,14 @@
 import argparse
+import functools
+import io
 import re
 import sys
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
 from typing import List
+from typing import NamedTuple
 from typing import Optional
 from typing import Tuple
 
@@ -15,7 +22,8 @@ from .helpers import _color_red
 
 DEFAULT_TYPES = ['change', 'ci', 'docs', 'feat', 'fix', 'refactor', 'remove', 'revert', 'test']
 
-rules_output_status = {
+# Default (all rules passing) status of each rule; every lint run works on its own copy
+DEFAULT_RULES_OUTPUT_STATUS: Dict[str, bool] = {
     'empty_message': False,
     'error_body_format': False,
     'error_body_length': False,
@@ -30,6 +38,32 @@ rules_output_status = {
     'missing_colon': False,
 }
 
+RULE_ICONS = {True: _color_red('FAIL:'), False: _color_green('OK:  ')}  # True = error found, False = success
+
+SCISSORS_LINE = '# ------------------------ >8 ------------------------'
+
+REGEX_TYPE_AND_SCOPE = re.compile(r'^(?P<type>\w+)(\((?P<scope>[^\)]+)\))?(?P<breaking>!)?$')
+REGEX_SCOPE = re.compile(r'^[a-z0-9_/.,*-]*$')
+REGEX_SCOPE_CASE_INSENSITIVE = re.compile(r'^[a-zA-Z0-9_/.,*-]*$')  # adds A-Z to the allowed character set
+REGEX_FIXUP_SQUASH = re.compile(r'^(fixup|squash)')
+
+
+@dataclass
+class LintResult:
+    """Outcome of linting a single commit message."""
+
+    rules_output_status: Dict[str, bool] = field(default_factory=lambda: dict(DEFAULT_RULES_OUTPUT_STATUS))
+    commit_type: str = ''
+    commit_scope: Optional[str] = None
+    commit_summary: str = ''
+    breaking_change: bool = False
+    skipped: bool = False  # 'fixup!' and 'squash!' messages are not linted
+    phase_durations: Dict[str, float] = field(default_factory=dict, compare=False, repr=False)  # seconds per lint phase
+
+    @property
+    def failed(self) -> bool:
+        return any(self.rules_output_status.values())
+
 
 def get_allowed_types(args: argparse.Namespace) -> List[str]:
     # Provided types take precedence over default types
@@ -43,34 +77,33 @@ def get_allowed_scopes(args: argparse.Namespace) -> List[str]:
     return [scope.strip() for scope in scopes]
 
 
-def read_commit_message(file_path: str) -> str:
-    with open(file_path, encoding='utf-8') as file:
-        lines = file.readlines()
+def strip_commit_message(text: str) -> str:
+    """Remove the git scissors section and comment lines (starting with '#') from a raw commit message."""
+    if '#' not in text:
+        return text
 
-        scissor_line_index = None
-        for i, line in enumerate(lines):
-            if line.strip() == '# ------------------------ >8 ------------------------':
-                scissor_line_index = i
-                break
+    lines = io.StringIO(text).readlines()
 
-        if scissor_line_index is not None:
-            lines = lines[:scissor_line_index]
+    for i, line in enumerate(lines):
+        if line.strip() == SCISSORS_LINE:
+            lines = lines[:i]
+            break
 
-        lines = [line for line in lines if not line.startswith('#')]  # Remove comment lines (starting with '#')
-        content = ''.join(lines)
-        if not content.strip():
-            rules_output_status['empty_message'] = True
-        return content
+    return ''.join(line for line in lines if not line.startswith('#'))
 
 
-def split_message_title(message_title: str, args: argparse.Namespace) -> Tuple[str, Optional[str], str, bool]:
+def read_commit_message(file_path: str) -> str:
+    with open(file_path, encoding='utf-8') as file:
+        return strip_commit_message(file.read())
+
+
+def split_message_title(message_title: str, args: argparse.Namespace, rules_output_status: Dict[str, bool]) -> Tuple[str, Optional[str], str, bool]:
     """Split 'message title' into 'type/scope' and 'summary'."""
     type_and_scope, _, commit_summary = message_title.partition(': ')
     commit_summary = commit_summary.strip()
 
-    # Regex for type and scope of commitizen:
-    regex_type_and_scope = r'^(?P<type>\w+)(\((?P<scope>[^\)]+)\))?(?P<breaking>!)?$'
-    match = re.match(regex_type_and_scope, type_and_scope)
+    # Regex for type and scope of commitizen
+    match = REGEX_TYPE_AND_SCOPE.match(type_and_scope)
 
     if not match:
         if '(' in type_and_scope and ')' not in type_and_scope:
@@ -94,7 +127,7 @@ def split_message_title(message_title: str, args: argparse.Namespace) -> Tuple[s
     return commit_type, commit_scope, commit_summary, breaking_change
 
 
-def check_colon_after_type(message_title: str) -> bool:
+def check_colon_after_type(message_title: str, rules_output_status: Dict[str, bool]) -> bool:
     """Check for missing column between type / type(scope) and summary."""
     message_parts = message_title.split(': ', 1)  # split only on first occurrence
     if len(message_parts) != 2:
@@ -103,20 +136,18 @@ def check_colon_after_type(message_title: str) -> bool:
     return True
 
 
-def check_allowed_types(commit_type: str, args: argparse.Namespace) -> None:
+def check_allowed_types(commit_type: str, args: argparse.Namespace, rules_output_status: Dict[str, bool]) -> None:
     """Check for allowed types."""
     types: List[str] = get_allowed_types(args)
     if commit_type not in types:
         rules_output_status['error_type'] = True
 
 
-def check_scope(commit_scope: str, args: argparse.Namespace) -> None:
+def check_scope(commit_scope: str, args: argparse.Namespace, rules_output_status: Dict[str, bool]) -> None:
     """Check for scope capitalization and allowed characters"""
-    regex_scope = r'^[a-z0-9_/.,*-]*$'
-    if args.scope_case_insensitive:
-        regex_scope = r'^[a-zA-Z0-9_/.,*-]*$'  # adds A-Z to the allowed character set
+    regex_scope = REGEX_SCOPE_CASE_INSENSITIVE if args.scope_case_insensitive else REGEX_SCOPE
 
-    if commit_scope and not re.match(regex_scope, commit_scope):
+    if commit_scope and not regex_scope.match(commit_scope):
         rules_output_status['error_scope_capitalization'] = True
 
     # Check against the list of allowed scopes if provided
@@ -125,101 +156,96 @@ def check_scope(commit_scope: str, args: argparse.Namespace) -> None:
         rules_output_status['error_scope_allowed'] = True
 
 
-def check_summary_length(commit_summary: str, args: argparse.Namespace) -> None:
+def check_summary_length(commit_summary: str, args: argparse.Namespace, rules_output_status: Dict[str, bool]) -> None:
     """Check for summary length (between min and max allowed characters)"""
     summary_length = len(commit_summary)
     if summary_length < args.subject_min_length or summary_length > args.subject_max_length:
         rules_output_status['error_summary_length'] = True
 
 
-def check_summary_lowercase(commit_summary: str) -> None:
+def check_summary_lowercase(commit_summary: str, rules_output_status: Dict[str, bool]) -> None:
     """Check for summary starting with an uppercase letter (rule disabled in default config)"""
-    if commit_summary[0].islower():
+    if commit_summary[:1].islower():
         rules_output_status['error_summary_capitalization'] = True
 
 
-def check_summary_period(commit_summary: str) -> None:
+def check_summary_period(commit_summary: str, rules_output_status: Dict[str, bool]) -> None:
     """Check for summary ending with a period"""
-    if commit_summary[-1] == '.':
+    if commit_summary.endswith('.'):
         rules_output_status['error_summary_period'] = True
 
 
-def check_body_empty_lines(message_body: List[str]) -> None:
+def check_body_empty_lines(message_body: List[str], rules_output_status: Dict[str, bool]) -> None:
     """Check for empty line between summary and body"""
     if not message_body[0].strip() == '':
         rules_output_status['error_body_format'] = True
 
 
-def check_body_lines_length(message_body: List[str], args: argparse.Namespace) -> None:
+def check_body_lines_length(message_body: List[str], args: argparse.Namespace, rules_output_status: Dict[str, bool]) -> None:
     """Check for body lines length (shorter than max allowed characters)"""
     if not all(len(line) <= args.body_max_line_length for line in message_body):
         rules_output_status['error_body_length'] = True
 
 
-def _get_icon_for_rule(status: bool) -> str:
-    """Return a icon depending on the status of the rule (True = error found, False = success))"""
-    return f'{ _color_red("FAIL:")}' if status else f'{_color_green("OK:  ")}'
+class ReportTemplate(NamedTuple):
+    """Static parts of the failure report, rendered once per configuration."""
 
+    header: str  # text before the colored commit message title
+    structure: str  # text between the title and the rules block
+    rule_lines: Tuple[Tuple[str, str], ...]  # (rule id, rule text after the status icon)
+    footer: str
 
-def print_report(commit_type: str, commit_scope: Optional[str], commit_summary: str, breaking_change: bool, args) -> None:
-    # Color the input commit message with matching element colors
-    append_bang = '' if not breaking_change else '!'
-    commit_message = f'{_color_purple(commit_type)}{_color_purple(append_bang)}: { _color_orange( commit_summary)}'
-    if commit_scope:
-        commit_message = f'{_color_purple(commit_type)}({ _color_blue( commit_scope)}){_color_purple(append_bang)}: { _color_orange( commit_summary)}'
 
-    rule_messages: List[str] = []
+class ReportOptions(NamedTuple):
+    """Arguments the failure report depends on (hashable, used as the template cache key)."""
 
-    # TYPES messages
-    rule_messages.append(
-        f"{_get_icon_for_rule(rules_output_status['error_type'])} {_color_purple('<type>')} is mandatory, use one of the following: [{_color_purple(', '.join(get_allowed_types(args)))}]"
-    )
+    types: Tuple[str, ...]
+    scopes: Tuple[str, ...]
+    subject_min_length: int
+    subject_max_length: int
+    body_max_line_length: int
+    summary_uppercase: bool
+    scope_case_insensitive: bool
+    allow_breaking: bool
 
-    if not args.allow_breaking:
-        rule_messages.append(
-            f"{_get_icon_for_rule(rules_output_status['error_breaking'])} {_color_purple('<type>')} must not include {_color_purple('!')} to indicate a breaking change"
-        )
 
-    # SCOPE messages
-    rule_messages.append(
-        f"{_get_icon_for_rule(rules_output_status['error_scope_format'])} {_color_blue('(<optional-scope>)')} if used, must be enclosed in parentheses"
-    )
+@functools.lru_cache(maxsize=32)
+def _build_report_template(options: ReportOptions) -> ReportTemplate:
+    allowed_types = get_allowed_types(argparse.Namespace(types=list(options.types)))
+    rule_lines: List[Tuple[str, str]] = []
 
-    if args.scope_case_insensitive:
-        rule_messages.append(
-            f"{_get_icon_for_rule(rules_output_status['error_scope_capitalization'])} {_color_blue('(<optional-scope>)')} if used, must not contain whitespace"
-        )
+    # TYPES messages
+    rule_lines.append(('error_type', f"{_color_purple('<type>')} is mandatory, use one of the following: [{_color_purple(', '.join(allowed_types))}]"))
+    if not options.allow_breaking:
+        rule_lines.append(('error_breaking', f"{_color_purple('<type>')} must not include {_color_purple('!')} to indicate a breaking change"))
+
+    # SCOPE messages
+    rule_lines.append(('error_scope_format', f"{_color_blue('(<optional-scope>)')} if used, must be enclosed in parentheses"))
+    if options.scope_case_insensitive:
+        rule_lines.append(('error_scope_capitalization', f"{_color_blue('(<optional-scope>)')} if used, must not contain whitespace"))
     else:
-        rule_messages.append(
-            f"{_get_icon_for_rule(rules_output_status['error_scope_capitalization'])} {_color_blue('(<optional-scope>)')} if used, must be written in lower case without whitespace"
-        )
-    if args.scopes:
-        rule_messages.append(
-            f"{_get_icon_for_rule(rules_output_status['error_scope_allowed'])} {_color_blue('(<optional-scope>)')} if used, must be one of the following allowed scopes: [{_color_blue(', '.join(args.scopes))}]"
+        rule_lines.append(('error_scope_capitalization', f"{_color_blue('(<optional-scope>)')} if used, must be written in lower case without whitespace"))
+    if options.scopes:
+        rule_lines.append(
+            (
+                'error_scope_allowed',
+                f"{_color_blue('(<optional-scope>)')} if used, must be one of the following allowed scopes: [{_color_blue(', '.join(options.scopes))}]",
+            )
         )
 
     # SUMMARY messages
-    rule_messages.append(f"{_get_icon_for_rule(rules_output_status['error_summary_period'])} {_color_orange('<summary>')} must not end with a period '.'")
-    rule_messages.append(
-        f"{_get_icon_for_rule(rules_output_status['error_summary_length'])} {_color_orange('<summary>')} must be between {args.subject_min_length} and {args.subject_max_length} characters long"
+    rule_lines.append(('error_summary_period', f"{_color_orange('<summary>')} must not end with a period '.'"))
+    rule_lines.append(
+        ('error_summary_length', f"{_color_orange('<summary>')} must be between {options.subject_min_length} and {options.subject_max_length} characters long")
     )
-    if args.summary_uppercase:
-        rule_messages.append(
-            f"{_get_icon_for_rule(rules_output_status['error_summary_capitalization'])} {_color_orange('<summary>')} must start with an uppercase letter"
-        )
+    if options.summary_uppercase:
+        rule_lines.append(('error_summary_capitalization', f"{_color_orange('<summary>')} must start with an uppercase letter"))
 
     # BODY messages
-    rule_messages.append(
-        f"{_get_icon_for_rule(rules_output_status['error_body_length'])} {_color_grey('<body>')} lines must be no longer than {args.body_max_line_length} characters"
-    )
-    rule_messages.append(
-        f"{_get_icon_for_rule(rules_output_status['error_body_format'])} {_color_grey('<body>')} must be separated from the 'summary' by a blank line"
-    )
-
-    # Combine the rule messages into the final report block
-    message_rules_block = '    ' + '\n        '.join(rule_messages)
+    rule_lines.append(('error_body_length', f"{_color_grey('<body>')} lines must be no longer than {options.body_max_line_length} characters"))
+    rule_lines.append(('error_body_format', f"{_color_grey('<body>')} must be separated from the 'summary' by a blank line"))
 
-    full_guide_message = f"""\n {_color_red("INVALID COMMIT MESSAGE ---> ")}{commit_message}
+    structure = f"""
     _______________________________________________________________
     Commit message structure:  {_color_purple('<type>')}{_color_blue("(<optional-scope>)")}: {_color_orange('<summary>')}
                                 <... empty line ...>
@@ -227,14 +253,50 @@ def print_report(commit_type: str, commit_scope: Optional[str], commit_summary:
                                 {_color_grey('<optional body lines>')}
     _______________________________________________________________
     Commit message rules:
-    {message_rules_block}
-    """
-    print(full_guide_message)
-    print(f'To preserve and correct a commit message, run: {_color_bold_green("git commit --edit --file=$(git rev-parse --git-dir)/COMMIT_EDITMSG")}\n')
+        """
+    hint = f'To preserve and correct a commit message, run: {_color_bold_green("git commit --edit --file=$(git rev-parse --git-dir)/COMMIT_EDITMSG")}'
+    footer = f'\n    \n{hint}\n\n'
+
+    return ReportTemplate(f'\n {_color_red("INVALID COMMIT MESSAGE ---> ")}', structure, tuple(rule_lines), footer)
+
+
+def get_report_template(args: argparse.Namespace) -> ReportTemplate:
+    options = ReportOptions(
+        tuple(args.types or ()),
+        tuple(args.scopes or ()),
+        args.subject_min_length,
+        args.subject_max_length,
+        args.body_max_line_length,
+        args.summary_uppercase,
+        args.scope_case_insensitive,
+        args.allow_breaking,
+    )
+    return _build_report_template(options)
 
 
-def parse_args(argv: List[str]) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(prog='conventional-pre-commit', description='Check a git commit message for Conventional Commits formatting.')
+def render_report(result: LintResult, args: argparse.Namespace) -> str:
+    """Fill the status icons and the highlighted commit message title into the report template."""
+    template = get_report_template(args)
+    rules_output_status = result.rules_output_status
+
+    # Color the input commit message with matching element colors
+    append_bang = '' if not result.breaking_change else '!'
+    commit_message = f'{_color_purple(result.commit_type)}{_color_purple(append_bang)}: {_color_orange(result.commit_summary)}'
+    if result.commit_scope:
+        commit_message = (
+            f'{_color_purple(result.commit_type)}({_color_blue(result.commit_scope)}){_color_purple(append_bang)}: {_color_orange(result.commit_summary)}'
+        )
+
+    message_rules_block = '\n        '.join(f'{RULE_ICONS[rules_output_status[rule]]} {rule_text}' for rule, rule_text in template.rule_lines)
+    return f'{template.header}{commit_message}{template.structure}{message_rules_block}{template.footer}'
+
+
+def print_report(result: LintResult, args: argparse.Namespace) -> None:
+    sys.stdout.write(render_report(result, args))  # single buffered write of the whole report
+
+
+def add_rule_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments configuring the commit message rules (shared by all entry points)."""
     parser.add_argument('--types', type=str, nargs='*', help="Redefine the list of allowed 'Types'")
     parser.add_argument('--scopes', type=str, nargs='*', help="Setting the list of allowed 'Scopes'")
     parser.add_argument('--subject-min-length', type=int, default=20, help="Minimum length of the 'Summary'")
@@ -243,58 +305,186 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     parser.add_argument('--summary-uppercase', action='store_true', help="'Summary' must start with an uppercase letter")
     parser.add_argument('--scope-case-insensitive', action='store_true', help='Allow uppercase letters in the optional scope.')
     parser.add_argument('--allow-breaking', action='store_true', help='Allow exclamation mark in the commit type')
-    parser.add_argument('input', type=str, help='A file containing a git commit message')
-    return parser.parse_args(argv)
 
 
-def main(argv: Optional[List[str]] = None) -> int:
-    argv = argv or sys.argv[1:]
-    args = parse_args(argv)
+def _regex_pattern(pattern: str) -> str:
+    try:
+        re.compile(pattern)
+    except re.error as error:
+        raise argparse.ArgumentTypeError(f"invalid skip pattern '{pattern}': {error}") from error
+    return pattern
 
-    # Parse the commit message in to parts
-    input_commit_message = read_commit_message(args.input)
 
-    if not input_commit_message.strip():
-        print('FAIL: Commit message seems to be empty.')
-        return 1
+def add_skip_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments selecting git history commits that are not linted at all."""
+    parser.add_argument('--skip-merges', action='store_true', help='Do not lint merge commits')
+    parser.add_argument('--skip-author', type=_regex_pattern, action='append', help="Do not lint commits whose 'Name <email>' of author matches this regex")
+    parser.add_argument(
+        '--skip-committer', type=_regex_pattern, action='append', help="Do not lint commits whose 'Name <email>' of committer matches this regex"
+    )
+    parser.add_argument('--skip-title', type=_regex_pattern, action='append', help='Do not lint commits whose title matches this regex')
 
-    message_lines = input_commit_message.strip().split('\n')  # Split the commit message into lines
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='conventional-pre-commit', description='Check a git commit message for Conventional Commits formatting.')
+    add_rule_arguments(parser)
+    parser.add_argument('--metrics-file', type=str, help='Add lint latency and rule violation metrics to this OpenMetrics textfile')
+    parser.add_argument('--range', type=str, help="Lint all commits of a git revision range (e.g. 'main..HEAD') instead of the 'input' file")
+    sample_group = parser.add_mutually_exclusive_group()
+    sample_group.add_argument('--sample', type=int, help="Lint only N commits of the '--range', selected uniformly at random")
+    sample_group.add_argument('--sample-rate', type=float, help="Lint only this fraction (0-1) of the commits of the '--range'")
+    parser.add_argument('--sample-seed', type=int, help="Seed of the random commit selection of the '--range', for reproducible samples (default: 0)")
+    add_skip_filter_arguments(parser)
+    parser.add_argument('--stdin-batch', action='store_true', help="Lint NUL-separated commit messages read from stdin instead of the 'input' file")
+    parser.add_argument('--stdin-batch-ids', action='store_true', help="Each '--stdin-batch' message starts with an id terminated by a newline")
+    parser.add_argument('input', type=str, nargs='?', help='A file containing a git commit message')
+    args = parser.parse_args(argv)
+
+    input_modes = sum(bool(mode) for mode in (args.input, args.range, args.stdin_batch))
+    if not input_modes:
+        parser.error("the 'input' file, '--range' or '--stdin-batch' is required")
+    if input_modes > 1:
+        parser.error("only one of the 'input' file, '--range' and '--stdin-batch' can be given")
+    if args.stdin_batch_ids and not args.stdin_batch:
+        parser.error("'--stdin-batch-ids' requires '--stdin-batch'")
+    if (args.sample is not None or args.sample_rate is not None) and not args.range:
+        parser.error("'--sample' and '--sample-rate' require '--range'")
+    if args.sample_seed is not None and not args.range:
+        parser.error("'--sample-seed' requires '--range'")
+    if args.sample is not None and args.sample < 1:
+        parser.error("'--sample' must be a positive number")
+    if args.sample_rate is not None and not 0 < args.sample_rate <= 1:
+        parser.error("'--sample-rate' must be between 0 and 1")
+    if (args.skip_merges or args.skip_author or args.skip_committer or args.skip_title) and not args.range:
+        parser.error("'--skip-merges', '--skip-author', '--skip-committer' and '--skip-title' require '--range'")
+
+    if args.sample_seed is None:
+        args.sample_seed = 0
+    return args
+
+
+def parse_commit_message(message: str, args: argparse.Namespace, result: LintResult) -> Optional[List[str]]:
+    """Split the message into title parts (stored in the result) and body lines.
+
+    Returns None if the message can not be checked any further (empty, 'fixup!'/'squash!' or missing colon).
+    """
+    rules_output_status = result.rules_output_status
+
+    if not message.strip():
+        rules_output_status['empty_message'] = True
+        return None
+
+    message_lines = message.strip().split('\n')  # Split the commit message into lines
     message_title = message_lines[0]  # The summary is the first line
     message_body = message_lines[1:]  # The body is everything after the summary, if it exists
 
     # Skip message lining if the commit message is 'fixup!' or 'squash!' (will not stay in git history anyway)
-    if re.match(r'^(fixup|squash)', message_title):
-        return 0
+    if REGEX_FIXUP_SQUASH.match(message_title):
+        result.skipped = True
+        return None
+
+    if not check_colon_after_type(message_title, rules_output_status):
+        return None
+
+    commit_type, commit_scope, commit_summary, breaking_change = split_message_title(message_title, args, rules_output_status)
+    result.commit_type, result.commit_scope, result.commit_summary, result.breaking_change = commit_type, commit_scope, commit_summary, breaking_change
+    return message_body
 
-    if not check_colon_after_type(message_title):
-        print(f'FAIL: Missing colon after {_color_purple("<type>")} or {_color_blue("(<optional-scope>)")}.')
-        print(f'\nEnsure the commit message has the format "{_color_purple("<type>")}{_color_blue("(<optional-scope>)")}: {_color_orange("<summary>")}"')
-        return 1
 
-    commit_type, commit_scope, commit_summary, breaking_change = split_message_title(message_title, args)
+def run_checks(message_body: List[str], args: argparse.Namespace, result: LintResult) -> None:
+    """Run the title and body rules on an already parsed commit message."""
+    rules_output_status = result.rules_output_status
 
     # Commit message title (first line) checks
-    check_allowed_types(commit_type, args)
-    if commit_scope:
-        check_scope(commit_scope, args)
-    check_summary_length(commit_summary, args)
-    check_summary_period(commit_summary)
+    check_allowed_types(result.commit_type, args, rules_output_status)
+    if result.commit_scope:
+        check_scope(result.commit_scope, args, rules_output_status)
+    check_summary_length(result.commit_summary, args, rules_output_status)
+    check_summary_period(result.commit_summary, rules_output_status)
     if args.summary_uppercase:
-        check_summary_lowercase(commit_summary)
+        check_summary_lowercase(result.commit_summary, rules_output_status)
 
     # Commit message body checks
     if message_body:
-        check_body_empty_lines(message_body)
-        check_body_lines_length(message_body, args)
+        check_body_empty_lines(message_body, rules_output_status)
+        check_body_lines_length(message_body, args, rules_output_status)
+
+
+def lint_commit_message(message: str, args: argparse.Namespace) -> LintResult:
+    """Run all checks on a (comment-stripped) commit message.
+
+    The result holds its own copy of the rules status, so this function has no shared mutable state
+    and can be called repeatedly or concurrently from multiple threads.
+    """
+    result = LintResult()
+
+    parse_started = time.perf_counter()
+    message_body = parse_commit_message(message, args, result)
+    checks_started = time.perf_counter()
+    if message_body is not None:
+        run_checks(message_body, args, result)
+
+    result.phase_durations['parse'] = checks_started - parse_started
+    result.phase_durations['checks'] = time.perf_counter() - checks_started
+    return result
+
+
+def report_result(result: LintResult, args: argparse.Namespace) -> int:
+    """Print the output for a lint result and return the exit code."""
+    if result.rules_output_status['empty_message']:
+        print('FAIL: Commit message seems to be empty.')
+        return 1
+
+    if result.rules_output_status['missing_colon']:
+        print(f'FAIL: Missing colon after {_color_purple("<type>")} or {_color_blue("(<optional-scope>)")}.')
+        print(f'\nEnsure the commit message has the format "{_color_purple("<type>")}{_color_blue("(<optional-scope>)")}: {_color_orange("<summary>")}"')
+        return 1
 
     # Create report if issues found
-    if any(value for value in rules_output_status.values()):
-        print_report(commit_type, commit_scope, commit_summary, breaking_change, args)
+    if result.failed:
+        print_report(result, args)
         return 1
 
     # No output and exit RC 0 if no issues found
     return 0
 
 
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = argv or sys.argv[1:]
+    args = parse_args(argv)
+
+    if args.range:
+        from .audit import run_range_audit
+
+        return run_range_audit(args)
+
+    if args.stdin_batch:
+        from .batch import run_stdin_batch
+
+        return run_stdin_batch(args, sys.stdin.buffer, sys.stdout)
+
+    read_started = time.perf_counter()
+    input_commit_message = read_commit_message(args.input)
+    read_duration = time.perf_counter() - read_started
+
+    result = lint_commit_message(input_commit_message, args)
+
+    report_started = time.perf_counter()
+    return_code = report_result(result, args)
+    report_duration = time.perf_counter() - report_started
+
+    if args.metrics_file:
+        from .metrics import LintMetrics
+        from .metrics import write_metrics_file
+
+        metrics = LintMetrics()
+        metrics.observe_phase('read', read_duration)
+        metrics.observe_result(result)
+        metrics.observe_phase('report', report_duration)
+        write_metrics_file(args.metrics_file, metrics)
+
+    return return_code
+
+
 if __name__ == '__main__':
     raise SystemExit(main())
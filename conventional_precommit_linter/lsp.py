@@ -0,0 +1,319 @@
+import argparse
+import json
+import sys
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .hook import add_rule_arguments
+from .hook import check_colon_after_type
+from .hook import get_allowed_types
+from .hook import LintResult
+from .hook import REGEX_FIXUP_SQUASH
+from .hook import run_checks
+from .hook import SCISSORS_LINE
+from .hook import split_message_title
+
+SERVER_NAME = 'conventional-precommit-linter'
+SEVERITY_ERROR = 1
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+ERROR_PARSE = -32700
+ERROR_INVALID_REQUEST = -32600
+ERROR_METHOD_NOT_FOUND = -32601
+ERROR_INTERNAL = -32603
+
+# Kinds of the buffer lines
+LINE_TEXT = 0
+LINE_TEXT_TOO_LONG = 1
+LINE_BLANK = 2
+LINE_BLANK_TOO_LONG = 3  # whitespace only, but still checked by the body line length rule
+LINE_COMMENT = 4
+LINE_SCISSORS = 5
+
+# A rule violation found on a single line: (rule id, start index, end index)
+Span = Tuple[str, int, int]
+
+
+def _rule_messages(args: argparse.Namespace) -> Dict[str, str]:
+    scope_rule = 'must not contain whitespace' if args.scope_case_insensitive else 'must be written in lower case without whitespace'
+    return {
+        'error_body_format': "<body> must be separated from the 'summary' by a blank line",
+        'error_body_length': f'<body> lines must be no longer than {args.body_max_line_length} characters',
+        'error_breaking': '<type> must not include ! to indicate a breaking change',
+        'error_scope_allowed': f"(<optional-scope>) if used, must be one of the following allowed scopes: [{', '.join(args.scopes or [])}]",
+        'error_scope_capitalization': f'(<optional-scope>) if used, {scope_rule}',
+        'error_scope_format': '(<optional-scope>) if used, must be enclosed in parentheses',
+        'error_summary_capitalization': '<summary> must start with an uppercase letter',
+        'error_summary_length': f'<summary> must be between {args.subject_min_length} and {args.subject_max_length} characters long',
+        'error_summary_period': "<summary> must not end with a period '.'",
+        'error_type': f"<type> is mandatory, use one of the following: [{', '.join(get_allowed_types(args))}]",
+        'missing_colon': 'Missing colon after <type> or (<optional-scope>)',
+    }
+
+
+def _utf16_to_index(line: str, character: int) -> int:
+    """Convert an LSP (UTF-16 code units) column to a Python string index."""
+    if line.isascii():
+        return min(character, len(line))
+    units = 0
+    for index, char in enumerate(line):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def _index_to_utf16(line: str, index: int) -> int:
+    """Convert a Python string index to an LSP (UTF-16 code units) column."""
+    if line.isascii():
+        return index
+    return index + sum(1 for char in line[:index] if ord(char) > 0xFFFF)
+
+
+def lint_title(title: str, args: argparse.Namespace) -> List[Span]:
+    """Run the title rules and locate each violation in the (left-stripped) title."""
+    result = LintResult()
+    if not check_colon_after_type(title, result.rules_output_status):
+        return [('missing_colon', 0, len(title.rstrip()))]
+    result.commit_type, result.commit_scope, result.commit_summary, result.breaking_change = split_message_title(title, args, result.rules_output_status)
+    run_checks([], args, result)
+
+    type_and_scope, _, summary_part = title.partition(': ')
+    summary_start = len(type_and_scope) + 2 + len(summary_part) - len(summary_part.lstrip())
+    summary_end = max(summary_start, len(title.rstrip()))
+    scope_start = type_and_scope.find('(') + 1
+    scope_end = type_and_scope.find(')') if ')' in type_and_scope else len(type_and_scope)
+    bang = type_and_scope.rfind('!')
+
+    rule_spans = {
+        'error_type': (0, len(type_and_scope)),
+        'error_breaking': (bang, bang + 1),
+        'error_scope_format': (scope_start - 1, len(type_and_scope)),
+        'error_scope_capitalization': (scope_start, scope_end),
+        'error_scope_allowed': (scope_start, scope_end),
+        'error_summary_length': (summary_start, summary_end),
+        'error_summary_capitalization': (summary_start, summary_start + 1),
+        'error_summary_period': (summary_end - 1, summary_end),
+    }
+    return [(rule, *rule_spans[rule]) for rule, status in result.rules_output_status.items() if status]
+
+
+class CommitMessageDocument:
+    """Commit message buffer with per-line caching of the rule results.
+
+    An incremental change only invalidates the cached results of the lines it touches, so editing a body
+    line re-runs only the body-line checks of that line and editing the title re-runs only the title rules.
+    """
+
+    def __init__(self, text: str, args: argparse.Namespace) -> None:
+        self.args = args
+        self.rule_messages = _rule_messages(args)
+        self.lines: List[str] = []
+        self.line_kinds: List[Optional[int]] = []  # None = not classified since the last change
+        self.title_cache: Tuple[Optional[str], List[Span]] = (None, [])
+        self.set_text(text)
+
+    def set_text(self, text: str) -> None:
+        self.lines = text.split('\n')
+        self.line_kinds = [None] * len(self.lines)
+
+    def apply_change(self, change: Dict[str, Any]) -> None:
+        if 'range' not in change:
+            self.set_text(change['text'])
+            return
+
+        start, end = change['range']['start'], change['range']['end']
+        start_line = min(start['line'], len(self.lines) - 1)
+        end_line = min(end['line'], len(self.lines) - 1)
+        prefix = self.lines[start_line][: _utf16_to_index(self.lines[start_line], start['character'])]
+        suffix = self.lines[end_line][_utf16_to_index(self.lines[end_line], end['character']) :]
+
+        new_lines = (prefix + change['text'] + suffix).split('\n')
+        self.lines[start_line : end_line + 1] = new_lines
+        self.line_kinds[start_line : end_line + 1] = [None] * len(new_lines)
+
+    def _line_kind(self, line: str) -> int:
+        """Classify the line, running the body-line checks on it."""
+        line = line.rstrip('\r')
+        if line.strip() == SCISSORS_LINE:
+            return LINE_SCISSORS
+        if line.startswith('#'):
+            return LINE_COMMENT
+        too_long = len(line) > self.args.body_max_line_length
+        if not line.strip():
+            return LINE_BLANK_TOO_LONG if too_long else LINE_BLANK
+        return LINE_TEXT_TOO_LONG if too_long else LINE_TEXT
+
+    def _refresh_line_kinds(self) -> List[Optional[int]]:
+        line_kinds = self.line_kinds
+        try:
+            line_number = line_kinds.index(None)
+            while True:
+                line_kinds[line_number] = self._line_kind(self.lines[line_number])
+                line_number = line_kinds.index(None, line_number + 1)
+        except ValueError:
+            pass
+        return line_kinds
+
+    def _title_spans(self, title: str) -> List[Span]:
+        if self.title_cache[0] != title:
+            self.title_cache = (title, lint_title(title, self.args))
+        return self.title_cache[1]
+
+    def _diagnostic(self, line_number: int, rule: str, start: int, end: int) -> Dict[str, Any]:
+        line = self.lines[line_number]
+        return {
+            'range': {
+                'start': {'line': line_number, 'character': _index_to_utf16(line, start)},
+                'end': {'line': line_number, 'character': _index_to_utf16(line, end)},
+            },
+            'severity': SEVERITY_ERROR,
+            'source': SERVER_NAME,
+            'code': rule,
+            'message': self.rule_messages[rule],
+        }
+
+    def diagnostics(self) -> List[Dict[str, Any]]:
+        """Return the LSP diagnostics of the current buffer."""
+        line_kinds = self._refresh_line_kinds()
+
+        # Only lines before the scissors line are part of the message ('read_commit_message' drops the rest)
+        message_end = line_kinds.index(LINE_SCISSORS) if LINE_SCISSORS in line_kinds else len(line_kinds)
+        content_lines = (line_number for line_number in range(message_end) if line_kinds[line_number] in (LINE_TEXT, LINE_TEXT_TOO_LONG))
+        title_line_number = next(content_lines, None)
+        if title_line_number is None:
+            return []
+        last_line_number = next(n for n in range(message_end - 1, title_line_number - 1, -1) if line_kinds[n] in (LINE_TEXT, LINE_TEXT_TOO_LONG))
+        has_body = last_line_number > title_line_number
+
+        title_line = self.lines[title_line_number].rstrip('\r')
+        title = title_line.lstrip() if has_body else title_line.strip()
+        if REGEX_FIXUP_SQUASH.match(title):
+            return []
+
+        title_offset = len(title_line) - len(title_line.lstrip())
+        title_spans = self._title_spans(title)
+        diagnostics = [self._diagnostic(title_line_number, rule, title_offset + start, title_offset + end) for rule, start, end in title_spans]
+        if not has_body or any(rule == 'missing_colon' for rule, _, _ in title_spans):
+            return diagnostics  # body is not checked if the title can not be parsed
+
+        body_line_numbers = range(title_line_number + 1, last_line_number + 1)
+        first_body_line_number = next(n for n in body_line_numbers if line_kinds[n] != LINE_COMMENT)
+        if line_kinds[first_body_line_number] not in (LINE_BLANK, LINE_BLANK_TOO_LONG):
+            diagnostics.append(self._diagnostic(first_body_line_number, 'error_body_format', 0, len(self.lines[first_body_line_number].rstrip('\r'))))
+        for line_number in body_line_numbers:
+            if line_kinds[line_number] not in (LINE_TEXT_TOO_LONG, LINE_BLANK_TOO_LONG):
+                continue
+            # The hook strips the whole message, so trailing whitespace of the last line does not count
+            line_length = len(self.lines[line_number].rstrip() if line_number == last_line_number else self.lines[line_number].rstrip('\r'))
+            if line_length > self.args.body_max_line_length:
+                diagnostics.append(self._diagnostic(line_number, 'error_body_length', self.args.body_max_line_length, line_length))
+        return diagnostics
+
+
+class CommitMessageLanguageServer:
+    """Minimal Language Server Protocol server (JSON-RPC over stdio) validating commit message buffers."""
+
+    def __init__(self, args: argparse.Namespace, reader: BinaryIO, writer: BinaryIO) -> None:
+        self.args = args
+        self.reader = reader
+        self.writer = writer
+        self.documents: Dict[str, CommitMessageDocument] = {}
+        self.shutdown_requested = False
+
+    def read_message(self) -> Optional[Any]:
+        """Read the next JSON-RPC message (None at the end of the input), raise ValueError if it is not valid JSON."""
+        content_length = 0
+        while True:
+            header = self.reader.readline()
+            if not header:
+                return None
+            header = header.strip()
+            if not header:
+                break
+            name, _, value = header.decode('ascii').partition(':')
+            if name.strip().lower() == 'content-length':
+                content_length = int(value.strip())
+        return json.loads(self.reader.read(content_length).decode('utf-8'))
+
+    def send_message(self, message: Dict[str, Any]) -> None:
+        body = json.dumps({'jsonrpc': '2.0', **message}, separators=(',', ':')).encode('utf-8')
+        self.writer.write(b'Content-Length: %d\r\n\r\n%s' % (len(body), body))
+        self.writer.flush()
+
+    def publish_diagnostics(self, uri: str) -> None:
+        document = self.documents.get(uri)
+        diagnostics = document.diagnostics() if document else []
+        self.send_message({'method': 'textDocument/publishDiagnostics', 'params': {'uri': uri, 'diagnostics': diagnostics}})
+
+    def handle_request(self, request_id: Any, method: str) -> None:
+        if method == 'initialize':
+            capabilities = {'textDocumentSync': {'openClose': True, 'change': TEXT_DOCUMENT_SYNC_INCREMENTAL}}
+            self.send_message({'id': request_id, 'result': {'capabilities': capabilities, 'serverInfo': {'name': SERVER_NAME}}})
+        elif method == 'shutdown':
+            self.shutdown_requested = True
+            self.send_message({'id': request_id, 'result': None})
+        else:
+            self.send_error(request_id, ERROR_METHOD_NOT_FOUND, f'Method not found: {method}')
+
+    def handle_notification(self, method: str, params: Dict[str, Any]) -> None:
+        if method == 'textDocument/didOpen':
+            text_document = params['textDocument']
+            self.documents[text_document['uri']] = CommitMessageDocument(text_document['text'], self.args)
+        elif method == 'textDocument/didChange':
+            document = self.documents.get(params['textDocument']['uri'])
+            if document is None:
+                return  # change of a document that was never opened
+            for change in params['contentChanges']:
+                document.apply_change(change)
+        elif method == 'textDocument/didClose':
+            self.documents.pop(params['textDocument']['uri'], None)
+        else:
+            return  # 'initialized', '$/...' and other notifications need no action
+        self.publish_diagnostics(params['textDocument']['uri'])
+
+    def send_error(self, request_id: Any, code: int, message: str) -> None:
+        self.send_message({'id': request_id, 'error': {'code': code, 'message': message}})
+
+    def serve(self) -> int:
+        """Handle messages until 'exit'; a message that can not be handled never stops the server."""
+        while True:
+            try:
+                message = self.read_message()
+            except ValueError as error:
+                self.send_error(None, ERROR_PARSE, f'Parse error: {error}')
+                continue
+            if message is None:
+                return 1
+            if not isinstance(message, dict):
+                self.send_error(None, ERROR_INVALID_REQUEST, 'Invalid request: not a JSON object')
+                continue
+            method, params = message.get('method', ''), message.get('params') or {}
+            if method == 'exit':
+                return 0 if self.shutdown_requested else 1
+            try:
+                if 'id' in message:
+                    self.handle_request(message['id'], method)
+                else:
+                    self.handle_notification(method, params)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                if 'id' in message:
+                    self.send_error(message['id'], ERROR_INTERNAL, f'Internal error handling {method}: {error!r}')
+                else:
+                    print(f'{SERVER_NAME}: ignoring {method} notification: {error!r}', file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='conventional-precommit-linter-lsp', description='Language server validating git commit message buffers (e.g. COMMIT_EDITMSG) as they are typed.'
+    )
+    add_rule_arguments(parser)
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+    return CommitMessageLanguageServer(args, sys.stdin.buffer, sys.stdout.buffer).serve()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
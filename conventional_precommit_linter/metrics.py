@@ -0,0 +1,149 @@
+import os
+import sys
+import tempfile
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from .hook import DEFAULT_RULES_OUTPUT_STATUS
+from .hook import LintResult
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
+METRIC_PREFIX = 'conventional_precommit_linter'
+PHASES = ('read', 'parse', 'checks', 'report')
+MESSAGE_RESULTS = ('pass', 'fail', 'skipped')
+
+# Upper bounds (seconds) of the latency histogram buckets; '+Inf' is added on output
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Metric families in output order: (name, type, help)
+METRIC_FAMILIES: Tuple[Tuple[str, str, str], ...] = (
+    (f'{METRIC_PREFIX}_phase_duration_seconds', 'histogram', 'Duration of the commit message lint phases.'),
+    (f'{METRIC_PREFIX}_rule_violations', 'counter', 'Number of commit messages violating the rule.'),
+    (f'{METRIC_PREFIX}_messages', 'counter', 'Number of linted commit messages by result.'),
+)
+
+
+class LintMetrics:
+    """Cheap in-memory collector of lint latencies and rule violations."""
+
+    def __init__(self) -> None:
+        self.phase_bucket_counts: Dict[str, List[int]] = {phase: [0] * (len(DURATION_BUCKETS) + 1) for phase in PHASES}
+        self.phase_sums: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.rule_violations: Dict[str, int] = dict.fromkeys(DEFAULT_RULES_OUTPUT_STATUS, 0)
+        self.messages: Dict[str, int] = dict.fromkeys(MESSAGE_RESULTS, 0)
+
+    def observe_phase(self, phase: str, seconds: float) -> None:
+        self.phase_bucket_counts[phase][bisect_left(DURATION_BUCKETS, seconds)] += 1
+        self.phase_sums[phase] += seconds
+
+    def observe_result(self, result: LintResult) -> None:
+        """Record the parse/checks durations and rule violations of a single lint result."""
+        for phase, seconds in result.phase_durations.items():
+            self.observe_phase(phase, seconds)
+
+        for rule, status in result.rules_output_status.items():
+            if status:
+                self.rule_violations[rule] += 1
+
+        message_result = 'skipped' if result.skipped else 'fail' if result.failed else 'pass'
+        self.messages[message_result] += 1
+
+    def samples(self) -> Dict[str, float]:
+        """Return the collected metrics as OpenMetrics samples ('name{labels}' -> value)."""
+        samples: Dict[str, float] = {}
+        histogram_name = METRIC_FAMILIES[0][0]
+
+        for phase in PHASES:
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + (float('inf'),), self.phase_bucket_counts[phase]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                samples[f'{histogram_name}_bucket{{phase="{phase}",le="{le}"}}'] = cumulative
+            samples[f'{histogram_name}_count{{phase="{phase}"}}'] = cumulative
+            samples[f'{histogram_name}_sum{{phase="{phase}"}}'] = self.phase_sums[phase]
+
+        for rule, count in self.rule_violations.items():
+            samples[f'{METRIC_FAMILIES[1][0]}_total{{rule="{rule}"}}'] = count
+
+        for message_result, count in self.messages.items():
+            samples[f'{METRIC_FAMILIES[2][0]}_total{{result="{message_result}"}}'] = count
+
+        return samples
+
+
+def _read_samples(file_path: str) -> Dict[str, float]:
+    samples: Dict[str, float] = {}
+    try:
+        with open(file_path, encoding='utf-8') as file:
+            for line in file:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                name, _, value = line.rstrip('\n').rpartition(' ')
+                samples[name] = float(value)
+    except FileNotFoundError:
+        pass
+    return samples
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def render_samples(samples: Dict[str, float]) -> str:
+    """Render samples as an OpenMetrics text exposition, grouped by metric family."""
+    lines: List[str] = []
+    for family, metric_type, help_text in METRIC_FAMILIES:
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {metric_type}')
+        lines.extend(f'{name} {_format_value(value)}' for name, value in samples.items() if name.startswith(f'{family}_'))
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def _locked(lock_path: str) -> Iterator[None]:
+    """Hold an exclusive lock on the lock file (serializes concurrent jobs on the same runner)."""
+    with open(lock_path, 'a+b') as lock_file:
+        if sys.platform == 'win32':
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == 'win32':
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def write_metrics_file(file_path: str, metrics: LintMetrics) -> None:
+    """Add the collected metrics to the counters already in the textfile.
+
+    The file is merged under a lock and replaced atomically by rename, so concurrent jobs never
+    corrupt it and scrapers never see a partially written file.
+    """
+    with _locked(f'{file_path}.lock'):
+        samples = _read_samples(file_path)
+        for name, value in metrics.samples().items():
+            samples[name] = samples.get(name, 0) + value
+
+        fd, temp_path = tempfile.mkstemp(prefix='.metrics-', dir=os.path.dirname(os.path.abspath(file_path)))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as temp_file:
+                temp_file.write(render_samples(samples))
+            os.chmod(temp_path, 0o644)  # readable by the scraping exporter
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -0,0 +1,144 @@
+import argparse
+import random
+import subprocess
+import sys
+import time
+from typing import Generator
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .audit import print_failed_commits
+from .audit import reservoir_sample
+from .filters import compile_skip_filter
+from .helpers import _color_bold_green
+from .helpers import _color_orange
+from .helpers import _color_red
+from .history import CommitRecord
+from .history import git_error_message
+from .history import iter_commit_records
+from .hook import add_rule_arguments
+from .hook import add_skip_filter_arguments
+from .hook import lint_commit_message
+from .hook import LintResult
+
+
+def parse_ref_updates(lines: Iterable[str]) -> List[Tuple[str, str, str]]:
+    """Parse the '<old> <new> <ref>' lines git passes to the pre-receive hook."""
+    ref_updates = []
+    for line in lines:
+        if line.strip():
+            old, new, ref = line.split(maxsplit=2)
+            ref_updates.append((old, new, ref.strip()))
+    return ref_updates
+
+
+def iter_pushed_commits(ref_updates: List[Tuple[str, str, str]], timeout: Optional[float] = None) -> Generator[CommitRecord, None, None]:
+    """Stream the commits new to the repository, for all pushed refs in a single walk.
+
+    The refs are not updated yet while the hook runs, so '--not --all' excludes everything the repository
+    already had, and commits shared between the pushed refs are listed only once. The pushed objects are only
+    visible in git's object quarantine; git finds them through the environment this process inherits.
+
+    git computes the whole walk before it lists the first commit, so it is killed once the 'timeout' is spent
+    (raising subprocess.TimeoutExpired), however many commits were pushed.
+    """
+    new_revisions = [new for _, new, _ in ref_updates if new.strip('0')]  # all-zero object id = deleted ref
+    if new_revisions:
+        yield from iter_commit_records(['--not', '--all'], stdin_revisions=new_revisions, timeout=timeout)
+
+
+def _records_until(records: Iterator[CommitRecord], deadline: float) -> Iterator[CommitRecord]:
+    """Stream the records until the deadline passes."""
+    for record in records:
+        yield record
+        if time.monotonic() >= deadline:
+            return
+
+
+def check_pushed_commits(records: Iterable[CommitRecord], args: argparse.Namespace) -> int:
+    """Lint the pushed commits within the time budget, degrading to sampling (or accepting) once it is spent.
+
+    With '--on-timeout=sample' the commits are linted in order for the first half of the budget; the second half
+    samples the commits read after that. Commits not read within the budget are accepted without check, so the hook
+    never walks a huge push to its end. If listing the commits fails, the commits not read are accepted as well.
+    """
+    started = time.monotonic()
+    deadline = started + args.time_budget
+    lint_deadline = started + args.time_budget / 2 if args.on_timeout == 'sample' else deadline
+    walk_failed = False
+    walk_stopped = False
+
+    def read_records() -> Iterator[CommitRecord]:
+        nonlocal walk_failed, walk_stopped
+        try:
+            yield from records
+        except subprocess.TimeoutExpired:
+            walk_stopped = True
+        except (subprocess.CalledProcessError, OSError) as error:
+            message = git_error_message(error) if isinstance(error, subprocess.CalledProcessError) else str(error)
+            print(_color_orange(f'WARNING: listing the pushed commits failed: {message}'))
+            walk_failed = walk_stopped = True
+
+    skip_filter = compile_skip_filter(args)
+    candidate_records = (record for record in read_records() if not (skip_filter and skip_filter(record)))
+    checked_records: List[CommitRecord] = []
+    results: List[LintResult] = []
+
+    for record in candidate_records:
+        checked_records.append(record)
+        results.append(lint_commit_message(record.message, args))
+        if time.monotonic() >= lint_deadline:
+            break
+
+    # Commits left when the (first half of the) time budget was spent (none if all commits were checked)
+    sampled_records: List[CommitRecord] = []
+    sampled_commits = 0
+    if args.on_timeout == 'sample':
+        sampled_records, sampled_commits = reservoir_sample(_records_until(candidate_records, deadline), args.timeout_sample, random.Random(args.sample_seed))
+        checked_records.extend(sampled_records)
+        results.extend(lint_commit_message(record.message, args) for record in sampled_records)
+
+    reason = 'listing the pushed commits failed' if walk_failed else f'commit message check exceeded its time budget of {args.time_budget}s'
+    if next(candidate_records, None) is not None or walk_stopped:
+        sample_note = f', checked a random sample of {len(sampled_records)} of the next {sampled_commits} commits' if sampled_commits else ''
+        print(_color_orange(f'WARNING: {reason}{sample_note}, remaining commits accepted without check.'))
+    elif sampled_commits > len(sampled_records):
+        print(_color_orange(f'WARNING: {reason}, checked a random sample of the remaining commits.'))
+
+    if not any(result.failed for result in results):
+        return 0
+
+    print_failed_commits(checked_records, results)
+    print(f'\n{_color_red("Push rejected: invalid commit messages.")} Reword them with {_color_bold_green("git rebase -i")} and push again.')
+    return 1
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='conventional-precommit-linter-pre-receive', description='Server-side git pre-receive hook rejecting pushed commits with invalid commit messages.'
+    )
+    add_rule_arguments(parser)
+    add_skip_filter_arguments(parser)
+    parser.add_argument('--time-budget', type=float, default=5.0, help='Seconds the hook may spend checking commits before it degrades (default: 5)')
+    parser.add_argument(
+        '--on-timeout', choices=['sample', 'accept'], default='sample', help="Check a random sample of the remaining commits or accept them (default: 'sample')"
+    )
+    parser.add_argument('--timeout-sample', type=int, default=100, help="Size of the '--on-timeout=sample' random sample (default: 100)")
+    parser.add_argument('--sample-seed', type=int, default=0, help='Seed of the random commit selection, for reproducible samples')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv if argv is not None else sys.argv[1:])
+    pushed_commits = iter_pushed_commits(parse_ref_updates(sys.stdin), timeout=args.time_budget)
+    try:
+        return check_pushed_commits(pushed_commits, args)
+    finally:
+        pushed_commits.close()  # stops the git walk if the time budget was spent
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
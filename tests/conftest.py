@@ -1,8 +1,40 @@
+import subprocess
+
 import pytest
 
-from conventional_precommit_linter.hook import rules_output_status
+from conventional_precommit_linter.hook import DEFAULT_RULES_OUTPUT_STATUS
 
 
 @pytest.fixture()
 def default_rules_output_status():
-    return rules_output_status.copy()
+    return DEFAULT_RULES_OUTPUT_STATUS.copy()
+
+
+def _git(repo_path, *git_args):
+    return subprocess.run(['git', *git_args], cwd=repo_path, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture()
+def git_repo(tmp_path, monkeypatch):
+    """Empty git repository as the working directory; call 'commit(message)' to add commits."""
+    for variable, value in (
+        ('GIT_AUTHOR_NAME', 'Test Author'),
+        ('GIT_AUTHOR_EMAIL', 'author@example.com'),
+        ('GIT_COMMITTER_NAME', 'Test Committer'),
+        ('GIT_COMMITTER_EMAIL', 'committer@example.com'),
+        ('GIT_CONFIG_NOSYSTEM', '1'),
+        ('HOME', str(tmp_path)),
+    ):
+        monkeypatch.setenv(variable, value)
+    repo_path = tmp_path / 'repo'
+    repo_path.mkdir()
+    _git(repo_path, 'init', '-q', '-b', 'main')
+    monkeypatch.chdir(repo_path)
+
+    def commit(message, *git_args):
+        _git(repo_path, 'commit', '-q', '--allow-empty', '--cleanup=verbatim', '-m', message, *git_args)
+        return _git(repo_path, 'rev-parse', 'HEAD')
+
+    commit.git = lambda *git_args: _git(repo_path, *git_args)  # type: ignore[attr-defined]
+    commit.path = repo_path  # type: ignore[attr-defined]
+    return commit
@@ -0,0 +1,102 @@
+import random
+from collections import Counter
+
+import pytest
+
+from conventional_precommit_linter.audit import reservoir_sample
+from conventional_precommit_linter.audit import wilson_interval
+from conventional_precommit_linter.hook import main
+from conventional_precommit_linter.hook import parse_args
+
+VALID_MESSAGE = 'change: This is commit message without scope and body'
+INVALID_MESSAGE = 'fix: Fix bug'
+
+
+def test_range_audit_lints_all_commits(git_repo, capsys):
+    git_repo(VALID_MESSAGE)
+    invalid_sha = git_repo(INVALID_MESSAGE)
+    git_repo(VALID_MESSAGE)
+
+    assert main(['--range', 'HEAD']) == 1
+    output = capsys.readouterr().out
+    assert invalid_sha[:12] in output
+    assert '1 of 3 linted commits' in output
+
+    assert main(['--range', 'HEAD~1..HEAD']) == 0
+
+
+def test_range_audit_sample_is_reproducible(git_repo, capsys):
+    for index in range(20):
+        git_repo(INVALID_MESSAGE if index % 4 == 0 else VALID_MESSAGE)
+
+    main(['--range', 'HEAD', '--sample', '8', '--sample-seed', '7'])
+    first_output = capsys.readouterr().out
+    main(['--range', 'HEAD', '--sample', '8', '--sample-seed', '7'])
+    second_output = capsys.readouterr().out
+
+    assert first_output == second_output
+    assert 'Sampled 8 of 20 commits (seed 7)' in first_output
+    assert 'error_summary_length' in first_output
+
+
+def test_range_audit_sample_rate(git_repo, capsys):
+    for _ in range(10):
+        git_repo(VALID_MESSAGE)
+
+    assert main(['--range', 'HEAD', '--sample-rate', '1']) == 0
+    assert 'Sampled 10 of 10 commits' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    'argv',
+    [
+        ['--sample', '5', 'input'],  # sampling without '--range'
+        ['--range', 'HEAD', '--sample', '0'],
+        ['--range', 'HEAD', '--sample-rate', '1.5'],
+        ['--types', 'feat'],  # neither 'input' nor '--range'
+    ],
+)
+def test_range_audit_invalid_arguments(argv):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+
+def test_reservoir_sample_is_uniform():
+    rng = random.Random(0)
+    counts: Counter = Counter()
+    for _ in range(5000):
+        sample, total = reservoir_sample(iter(range(10)), 3, rng)
+        assert total == 10
+        assert sample == sorted(sample)
+        counts.update(sample)
+
+    # Each item is expected in 30% of the samples (1500 times)
+    assert all(1350 < counts[item] < 1650 for item in range(10))
+
+
+def test_reservoir_sample_shorter_stream():
+    assert reservoir_sample(iter('ab'), 5, random.Random(0)) == (['a', 'b'], 2)
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(10, 100)
+    assert low == pytest.approx(0.0552, abs=1e-3)
+    assert high == pytest.approx(0.1744, abs=1e-3)
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_range_audit_invalid_range(git_repo, capsys):
+    git_repo(VALID_MESSAGE)
+
+    assert main(['--range', 'nonexistent']) == 1
+    output = capsys.readouterr().out
+    assert "Can not list the commits of the range 'nonexistent'" in output
+    assert "fatal: bad revision 'nonexistent'" in output
+
+
+def test_range_audit_outside_git_repository(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('GIT_CEILING_DIRECTORIES', str(tmp_path.parent))
+
+    assert main(['--range', 'HEAD']) == 1
+    assert 'not a git repository' in capsys.readouterr().out
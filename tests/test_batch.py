@@ -0,0 +1,138 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conventional_precommit_linter import batch
+from conventional_precommit_linter.batch import format_batch_result
+from conventional_precommit_linter.batch import lint_commit_messages
+from conventional_precommit_linter.batch import run_stdin_batch
+from conventional_precommit_linter.hook import lint_commit_message
+from conventional_precommit_linter.hook import main
+from conventional_precommit_linter.hook import parse_args
+from conventional_precommit_linter.hook import strip_commit_message
+
+# Mix of passing and failing messages, so results differ between neighbouring items
+CORPUS = [
+    'feat(bootloader): This is commit message with scope and body\n\nThis is a text of body',
+    'change: This is commit message without scope and body',
+    'fix: Fix bug',
+    'change(rom): Fixed the another bug.',
+    'change this is commit message without body',
+    '   \n\n   \n',
+    'fixup! feat(bootloader): This is fixup commit message with scope and body',
+    'change(rom)!: This is commit message with scope and with exclamation mark',
+    'feat(Bootloader): This is commit message with scope and body\nThis is a text of body',
+    'delete(rom): Fixed the another bug with body\n\n' + 'x' * 120,
+    'change(examples*storage): This is commit message with asterisk in scope',
+    'change: This is commit message with scissors\n# ------------------------ >8 ------------------------\ndiff --git a/x b/x',
+]
+
+STRESS_THREADS = 16
+STRESS_REPEATS = 50
+
+
+def test_lint_commit_messages_matches_serial_results():
+    args = parse_args(['input'])
+    expected = [lint_commit_message(strip_commit_message(message), args) for message in CORPUS]
+
+    assert lint_commit_messages(CORPUS, args, max_workers=4) == expected
+
+
+@pytest.mark.parametrize('gil_enabled', [True, False])
+def test_lint_commit_messages_in_chunks(monkeypatch, gil_enabled):
+    args = parse_args(['input'])
+    corpus = CORPUS * STRESS_REPEATS
+    expected = [lint_commit_message(strip_commit_message(message), args) for message in corpus]
+    monkeypatch.setattr(batch, 'CHUNK_SIZE', 7)  # chunks not aligned with the corpus
+    monkeypatch.setattr(batch, '_gil_enabled', lambda: gil_enabled)
+
+    assert lint_commit_messages(corpus, args, max_workers=4) == expected
+
+
+@pytest.mark.parametrize('gil_enabled', [True, False])
+def test_lint_commit_messages_concurrent_stress(monkeypatch, gil_enabled):
+    monkeypatch.setattr(batch, 'CHUNK_SIZE', 16)
+    monkeypatch.setattr(batch, '_gil_enabled', lambda: gil_enabled)
+
+    args = parse_args(['--allow-breaking', 'input'])
+    expected = [lint_commit_message(strip_commit_message(message), args) for message in CORPUS]
+    corpus = CORPUS * STRESS_REPEATS
+
+    # Lint the same corpus from many threads at once, each thread also fanning out to its own pool
+    with ThreadPoolExecutor(max_workers=STRESS_THREADS) as executor:
+        futures = [executor.submit(lint_commit_messages, corpus, args, 4) for _ in range(STRESS_THREADS)]
+        all_results = [future.result() for future in futures]
+
+    for results in all_results:
+        assert results == expected * STRESS_REPEATS
+
+
+def test_lint_commit_message_does_not_leak_between_calls():
+    args = parse_args(['input'])
+    failing = lint_commit_message('fix: Fix bug', args)
+    passing = lint_commit_message('change: This is commit message without scope and body', args)
+
+    assert failing.failed
+    assert not passing.failed
+
+
+def _run_stdin_batch(stdin_data, *argv):
+    stdout = io.StringIO()
+    return_code = run_stdin_batch(parse_args(['--stdin-batch', *argv]), io.BytesIO(stdin_data), stdout)
+    return return_code, stdout.getvalue().splitlines()
+
+
+def test_stdin_batch_results_in_input_order():
+    stdin_data = b'\x00'.join(message.encode() for message in CORPUS) + b'\x00'
+    return_code, output_lines = _run_stdin_batch(stdin_data)
+
+    args = parse_args(['input'])
+    expected = [format_batch_result(str(index), lint_commit_message(strip_commit_message(message), args)) for index, message in enumerate(CORPUS)]
+    assert return_code == 1
+    assert output_lines == expected
+    assert output_lines[:3] == ['0\tOK', '1\tOK', '2\tFAIL\terror_summary_length']
+    assert output_lines[6] == '6\tSKIP'
+
+
+def test_stdin_batch_with_ids():
+    stdin_data = 'c0ffee\nchange: This is commit message without scope and body\n# comment\x00badé\nfix: Fix bug.'.encode()
+    return_code, output_lines = _run_stdin_batch(stdin_data, '--stdin-batch-ids')
+
+    assert return_code == 1
+    assert output_lines == ['c0ffee\tOK', 'badé\tFAIL\terror_summary_length,error_summary_period']
+
+
+def test_stdin_batch_crlf_newlines_like_message_file(tmp_path):
+    message = 'change: This is commit message with CRLF newlines\r\n\r\n' + 'x' * 100 + '\r\n# comment\r\n'
+    message_file = tmp_path / 'COMMIT_EDITMSG'
+    message_file.write_bytes(message.encode())
+    assert main([str(message_file)]) == 0
+
+    stdin_data = ('c0ffee\r\n' + message).encode()
+    assert _run_stdin_batch(stdin_data, '--stdin-batch-ids') == (0, ['c0ffee\tOK'])
+
+
+def test_stdin_batch_all_valid():
+    assert _run_stdin_batch(b'change: This is commit message without scope and body\x00') == (0, ['0\tOK'])
+    assert _run_stdin_batch(b'') == (0, [])
+
+
+def test_stdin_batch_ids_require_stdin_batch():
+    with pytest.raises(SystemExit):
+        parse_args(['--stdin-batch-ids', 'input'])
+
+
+@pytest.mark.parametrize(
+    'argv',
+    [
+        ['--stdin-batch', 'input'],
+        ['--stdin-batch', '--range', 'HEAD'],
+        ['--range', 'HEAD', 'input'],
+        ['--stdin-batch', '--sample-seed', '1'],
+        ['--stdin-batch', '--skip-merges'],
+    ],
+)
+def test_stdin_batch_rejects_other_modes_and_range_options(argv):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
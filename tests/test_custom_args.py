@@ -4,8 +4,10 @@ from typing import Tuple
 
 import pytest
 
+from conventional_precommit_linter.hook import lint_commit_message
 from conventional_precommit_linter.hook import main
-from conventional_precommit_linter.hook import rules_output_status
+from conventional_precommit_linter.hook import parse_args
+from conventional_precommit_linter.hook import read_commit_message
 
 # Default values for the commit message format
 TYPES = 'change,ci,docs,feat,fix,refactor,remove,revert,fox'
@@ -281,10 +283,6 @@ def commit_message(request, default_rules_output_status):
 def test_commit_message_with_args(commit_message, default_rules_output_status):  # pylint: disable=redefined-outer-name
     message_text, expected_output, cli_arguments = commit_message
 
-    # Reset rules_output_status to its default state before each test case
-    rules_output_status.clear()
-    rules_output_status.update(default_rules_output_status)
-
     # Create a temporary file to mock a commit message file input
     with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp:
         temp.write(message_text)
@@ -293,10 +291,11 @@ def test_commit_message_with_args(commit_message, default_rules_output_status):
     cli_arguments.append(temp_file_name)
 
     # Run the main function of your script with the temporary file and arguments
-    main(cli_arguments)
+    return_code = main(cli_arguments)
+    assert return_code == int(any(expected_output.values())), f'Unexpected return code on commit message: {message_text}'
 
-    # Retrieve the actual rules_output_status after running the main function
-    actual_output = rules_output_status
+    # Lint the same message directly to retrieve the rules_output_status
+    actual_output = lint_commit_message(read_commit_message(temp_file_name), parse_args(cli_arguments)).rules_output_status
 
     # Assert that the actual rules_output_status matches the expected output
     assert actual_output == expected_output, f'Failed on commit message: {message_text}'
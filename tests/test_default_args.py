@@ -2,8 +2,10 @@ import tempfile
 
 import pytest
 
+from conventional_precommit_linter.hook import lint_commit_message
 from conventional_precommit_linter.hook import main
-from conventional_precommit_linter.hook import rules_output_status
+from conventional_precommit_linter.hook import parse_args
+from conventional_precommit_linter.hook import read_commit_message
 
 # Default values for the commit message format
 TYPES = 'change, ci, docs, feat, fix, refactor, remove, revert, test'
@@ -174,6 +176,11 @@ def commit_message_id(commit_message):  # pylint: disable=redefined-outer-name
                 'error_type': True,
             },
         ),
+        (
+            # Expected FAIL: empty 'summary' followed by a body
+            'feat: \n\nThis is a text of body',
+            {'error_summary_length': True},
+        ),
     ],
     # Use the commit message to generate IDs for each test case
     ids=commit_message_id,
@@ -187,19 +194,16 @@ def commit_message(request, default_rules_output_status):
 def test_commit_message(commit_message, default_rules_output_status):  # pylint: disable=redefined-outer-name
     message_text, expected_output = commit_message
 
-    # Reset rules_output_status to its default state before each test case
-    rules_output_status.clear()
-    rules_output_status.update(default_rules_output_status)
-
     # Create a temporary file to mock a commit message file input
     with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp:
         temp.write(message_text)
         temp_file_name = temp.name
 
-    main([temp_file_name])  # Pass the file name as a positional argument
+    return_code = main([temp_file_name])  # Pass the file name as a positional argument
+    assert return_code == int(any(expected_output.values())), f'Unexpected return code on commit message: {message_text}'
 
-    # Retrieve the actual rules_output_status after running the main function
-    actual_output = rules_output_status
+    # Lint the same message directly to retrieve the rules_output_status
+    actual_output = lint_commit_message(read_commit_message(temp_file_name), parse_args([temp_file_name])).rules_output_status
 
     # Assert that the actual rules_output_status matches the expected output
     assert actual_output == expected_output, f'Failed on commit message: {message_text}'
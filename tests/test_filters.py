@@ -0,0 +1,71 @@
+import argparse
+
+import pytest
+
+from conventional_precommit_linter.filters import compile_skip_filter
+from conventional_precommit_linter.history import CommitRecord
+from conventional_precommit_linter.hook import main
+from conventional_precommit_linter.hook import parse_args
+
+VALID_MESSAGE = 'change: This is commit message without scope and body'
+
+
+def _record(message='fix: Fix bug', parents=('a',), author='Jane Doe <jane@example.com>', committer='Jane Doe <jane@example.com>'):
+    return CommitRecord(sha='0' * 40, parents=list(parents), author=author, committer=committer, message=message)
+
+
+def _skip_filter(*argv):
+    args: argparse.Namespace = parse_args(['--range', 'HEAD', *argv])
+    return compile_skip_filter(args)
+
+
+def test_no_skip_filter_configured():
+    assert _skip_filter() is None
+
+
+def test_skip_merges_by_parent_count():
+    skip_filter = _skip_filter('--skip-merges')
+    assert skip_filter(_record(parents=('a', 'b')))
+    assert not skip_filter(_record(parents=('a',)))
+    assert not skip_filter(_record(parents=()))
+
+
+def test_skip_author_committer_and_title_patterns():
+    skip_filter = _skip_filter('--skip-author', r'\[bot\]', '--skip-author', 'renovate', '--skip-committer', '^CI ', '--skip-title', '^Revert "')
+    assert skip_filter(_record(author='dependabot[bot] <bot@example.com>'))
+    assert not skip_filter(_record(author='Renovate Bot <bot@example.com>'))
+    assert skip_filter(_record(author='renovate <bot@example.com>'))
+    assert skip_filter(_record(committer='CI Runner <ci@example.com>'))
+    assert skip_filter(_record(message='Revert "feat: Add feature"\n\nThis reverts commit 123.'))
+    assert not skip_filter(_record(message='fix: Fix bug\n\nRevert "feat: Add feature"'))
+    assert not skip_filter(_record())
+
+
+def test_range_audit_skips_merge_and_bot_commits(git_repo, capsys):
+    git_repo(VALID_MESSAGE)
+    git_repo.git('checkout', '-q', '-b', 'feature')
+    git_repo(VALID_MESSAGE)
+    git_repo.git('checkout', '-q', 'main')
+    git_repo('bump version', '--author', 'release-bot <bot@example.com>')
+    git_repo.git('merge', '-q', '--no-ff', '-m', "Merge branch 'feature'", 'feature')
+
+    assert main(['--range', 'HEAD']) == 1
+    capsys.readouterr()
+
+    assert main(['--range', 'HEAD', '--skip-merges', '--skip-author', '-bot ']) == 0
+    output = capsys.readouterr().out
+    assert 'Skipped 2 commits matching the skip filters.' in output
+    assert 'All 2 linted commits' in output
+
+
+def test_invalid_skip_pattern(capsys):
+    with pytest.raises(SystemExit):
+        parse_args(['--range', 'HEAD', '--skip-title', '(unclosed'])
+    assert "invalid skip pattern '(unclosed'" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('argv', [['--skip-merges'], ['--skip-author', 'bot'], ['--skip-committer', 'CI'], ['--skip-title', '^Revert']])
+def test_skip_filters_require_range(argv, capsys):
+    with pytest.raises(SystemExit):
+        parse_args([*argv, 'input'])
+    assert "require '--range'" in capsys.readouterr().err
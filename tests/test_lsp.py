@@ -0,0 +1,202 @@
+import io
+import json
+
+import pytest
+
+from conventional_precommit_linter import lsp
+from conventional_precommit_linter.hook import lint_commit_message
+from conventional_precommit_linter.hook import parse_args
+from conventional_precommit_linter.hook import strip_commit_message
+from conventional_precommit_linter.lsp import CommitMessageDocument
+from conventional_precommit_linter.lsp import CommitMessageLanguageServer
+from conventional_precommit_linter.lsp import LINE_TEXT
+from conventional_precommit_linter.lsp import LINE_TEXT_TOO_LONG
+
+ARGS = parse_args(['--scopes', 'bt,wifi', '--summary-uppercase', 'input'])
+
+# Buffers as they appear in the editor, including git comments and the scissors section
+BUFFERS = [
+    'feat(bt): Add support for the new bluetooth stack\n\nBody line\n# Please enter the commit message\n',
+    'fix: Fix bug.',
+    'fix(Rom)!: fix the bug in the rom code that crashes\nNo blank line\n',
+    'fix(wifi: Missing closing parenthesis of the scope',
+    'change this is commit message without body\n\nBody',
+    '\n\n  feat(wifi): Leading blank lines and whitespace\n\n' + 'x' * 101 + '\n\n\n',
+    'feat(bt): Title\n# comment between title and body\nbody without blank line',
+    'feat: \n\nbody with empty summary',
+    'fixup! whatever\n\nbody',
+    'feat(bt): Scissors cut the long diff away\n# ------------------------ >8 ------------------------\n' + 'y' * 200,
+    '# only comments\n\n',
+    'feat(bt): Whitespace only body lines are length checked\n\nBody\n' + ' ' * 150 + '\nBody',
+    'feat(bt): Whitespace only first body line is blank\n' + ' ' * 150 + '\nBody',
+    'feat(bt): Trailing whitespace lines are not part of the message\n\nBody\n' + ' ' * 150 + '\n',
+    'feat(bt): Trailing whitespace of the last body line is stripped\n\nBody\n' + 'x' * 100 + '   \n',
+    'feat(bt): Trailing whitespace of other body lines counts\n\n' + 'x' * 100 + '   \nBody',
+    ': \n  (Wx) feat   \n',
+]
+
+
+def _position(line, character):
+    return {'line': line, 'character': character}
+
+
+def _change(start, end, text):
+    return {'range': {'start': _position(*start), 'end': _position(*end)}, 'text': text}
+
+
+def _codes(diagnostics):
+    return sorted(diagnostic['code'] for diagnostic in diagnostics)
+
+
+@pytest.mark.parametrize(
+    'text, args',
+    [(text, ARGS) for text in BUFFERS] + [(': \n  (Wx) feat   \n', parse_args(['--body-max-line-length', '12', 'input']))],
+)
+def test_diagnostics_match_lint_engine(text, args):
+    result = lint_commit_message(strip_commit_message(text), args)
+    expected = sorted(rule for rule, status in result.rules_output_status.items() if status and rule != 'empty_message')
+
+    assert _codes(CommitMessageDocument(text, args).diagnostics()) == expected
+
+
+def test_diagnostic_ranges():
+    diagnostics = CommitMessageDocument('fix(Rom)!: fix bug.\n\n' + 'x' * 105, ARGS).diagnostics()
+    ranges = {diagnostic['code']: (diagnostic['range']['start'], diagnostic['range']['end']) for diagnostic in diagnostics}
+
+    assert ranges == {
+        'error_breaking': (_position(0, 8), _position(0, 9)),
+        'error_scope_allowed': (_position(0, 4), _position(0, 7)),
+        'error_scope_capitalization': (_position(0, 4), _position(0, 7)),
+        'error_summary_capitalization': (_position(0, 11), _position(0, 12)),
+        'error_summary_length': (_position(0, 11), _position(0, 19)),
+        'error_summary_period': (_position(0, 18), _position(0, 19)),
+        'error_body_length': (_position(2, 100), _position(2, 105)),
+    }
+
+
+def test_diagnostic_ranges_use_utf16_columns():
+    diagnostics = CommitMessageDocument('fix(🚀): Fix bug', ARGS).diagnostics()
+    ranges = {diagnostic['code']: (diagnostic['range']['start'], diagnostic['range']['end']) for diagnostic in diagnostics}
+
+    assert ranges['error_scope_capitalization'] == (_position(0, 4), _position(0, 6))
+    assert ranges['error_summary_length'] == (_position(0, 9), _position(0, 16))
+
+
+def test_incremental_changes_rerun_only_affected_rules(monkeypatch):
+    title_lints = []
+    original_lint_title = lsp.lint_title
+    monkeypatch.setattr(lsp, 'lint_title', lambda title, args: title_lints.append(title) or original_lint_title(title, args))
+
+    document = CommitMessageDocument('feat(bt): Add support for the new bluetooth stack\n\nfirst\nsecond\nthird', ARGS)
+    document.diagnostics()
+    assert len(title_lints) == 1
+
+    # Edit a body line: the title rules are not re-run, only the edited line is re-checked
+    document.apply_change(_change((3, 6), (3, 6), ' line' + 'z' * 100))
+    assert document.line_kinds[2:5] == [LINE_TEXT, None, LINE_TEXT]
+    assert _codes(document.diagnostics()) == ['error_body_length']
+    assert len(title_lints) == 1
+
+    # Insert a new body line: cached results of the following lines move along
+    document.apply_change(_change((2, 5), (2, 5), '\ninserted'))
+    assert document.lines[2:6] == ['first', 'inserted', 'second line' + 'z' * 100, 'third']
+    assert document.line_kinds[2:6] == [None, None, LINE_TEXT_TOO_LONG, LINE_TEXT]
+
+    # Edit the title: only the title rules are re-run
+    document.apply_change(_change((0, 0), (0, 4), 'feet'))
+    assert _codes(document.diagnostics()) == ['error_body_length', 'error_type']
+    assert title_lints == ['feat(bt): Add support for the new bluetooth stack', 'feet(bt): Add support for the new bluetooth stack']
+
+
+def test_full_document_change():
+    document = CommitMessageDocument('fix: Fix bug', ARGS)
+    document.apply_change({'text': 'feat(bt): Add support for the new bluetooth stack'})
+    assert document.diagnostics() == []
+
+
+def _frame(message):
+    body = json.dumps(message).encode('utf-8')
+    return b'Content-Length: %d\r\n\r\n%s' % (len(body), body)
+
+
+def _read_frames(data):
+    reader = io.BytesIO(data)
+    messages = []
+    while True:
+        header = reader.readline()
+        if not header:
+            return messages
+        content_length = int(header.split(b':')[1])
+        reader.readline()
+        messages.append(json.loads(reader.read(content_length)))
+
+
+def test_language_server_session():
+    uri = 'file:///repo/.git/COMMIT_EDITMSG'
+    requests = [
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {'capabilities': {}}},
+        {'jsonrpc': '2.0', 'method': 'initialized', 'params': {}},
+        {
+            'jsonrpc': '2.0',
+            'method': 'textDocument/didOpen',
+            'params': {'textDocument': {'uri': uri, 'languageId': 'git-commit', 'version': 1, 'text': 'fix: Fix bug'}},
+        },
+        {
+            'jsonrpc': '2.0',
+            'method': 'textDocument/didChange',
+            'params': {'textDocument': {'uri': uri, 'version': 2}, 'contentChanges': [_change((0, 12), (0, 12), ' in the bluetooth stack')]},
+        },
+        {'jsonrpc': '2.0', 'id': 2, 'method': 'textDocument/hover', 'params': {}},
+        {'jsonrpc': '2.0', 'method': 'textDocument/didClose', 'params': {'textDocument': {'uri': uri}}},
+        {'jsonrpc': '2.0', 'id': 3, 'method': 'shutdown'},
+        {'jsonrpc': '2.0', 'method': 'exit'},
+    ]
+    writer = io.BytesIO()
+    server = CommitMessageLanguageServer(ARGS, io.BytesIO(b''.join(_frame(request) for request in requests)), writer)
+
+    assert server.serve() == 0
+    initialize, opened, changed, hover, closed, shutdown = _read_frames(writer.getvalue())
+    assert initialize['result']['capabilities']['textDocumentSync']['change'] == 2
+    assert _codes(opened['params']['diagnostics']) == ['error_summary_length']
+    assert changed['params']['diagnostics'] == []
+    assert hover['error']['code'] == -32601
+    assert closed['params'] == {'uri': uri, 'diagnostics': []}
+    assert shutdown == {'jsonrpc': '2.0', 'id': 3, 'result': None}
+
+
+def test_language_server_exit_without_shutdown():
+    server = CommitMessageLanguageServer(ARGS, io.BytesIO(_frame({'jsonrpc': '2.0', 'method': 'exit'})), io.BytesIO())
+    assert server.serve() == 1
+
+
+def test_language_server_survives_invalid_messages(monkeypatch, capsys):
+    uri = 'file:///repo/.git/COMMIT_EDITMSG'
+    requests = [
+        b'Content-Length: 8\r\n\r\n{"broken',  # invalid JSON
+        _frame([1, 2]),
+        {'jsonrpc': '2.0', 'method': 'textDocument/didChange', 'params': {'textDocument': {'uri': 'file:///never/opened'}, 'contentChanges': []}},
+        {'jsonrpc': '2.0', 'method': 'textDocument/didOpen', 'params': {'textDocument': {'uri': uri, 'text': 'fix: Fix bug'}}},
+        {'jsonrpc': '2.0', 'method': 'textDocument/didChange', 'params': {'textDocument': {'uri': uri}, 'contentChanges': [{'range': {}, 'text': 'x'}]}},
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {}},
+        {'jsonrpc': '2.0', 'id': 2, 'method': 'shutdown'},
+        {'jsonrpc': '2.0', 'method': 'exit'},
+    ]
+    writer = io.BytesIO()
+    server = CommitMessageLanguageServer(ARGS, io.BytesIO(b''.join(request if isinstance(request, bytes) else _frame(request) for request in requests)), writer)
+
+    handle_request = server.handle_request
+
+    def failing_initialize(request_id, method):
+        if method == 'initialize':
+            raise RuntimeError('initialize failed')
+        handle_request(request_id, method)
+
+    monkeypatch.setattr(server, 'handle_request', failing_initialize)
+
+    assert server.serve() == 0
+    parse_error, invalid_request, opened, initialize, _ = _read_frames(writer.getvalue())
+    assert parse_error['id'] is None and parse_error['error']['code'] == -32700
+    assert invalid_request['id'] is None and invalid_request['error']['code'] == -32600
+    assert _codes(opened['params']['diagnostics']) == ['error_summary_length']
+    assert initialize['id'] == 1 and initialize['error']['code'] == -32603
+    assert 'ignoring textDocument/didChange notification' in capsys.readouterr().err
@@ -0,0 +1,75 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from conventional_precommit_linter.hook import main
+from conventional_precommit_linter.metrics import LintMetrics
+from conventional_precommit_linter.metrics import write_metrics_file
+
+MESSAGES_PREFIX = 'conventional_precommit_linter_messages_total'
+VIOLATIONS_PREFIX = 'conventional_precommit_linter_rule_violations_total'
+DURATION_PREFIX = 'conventional_precommit_linter_phase_duration_seconds'
+
+
+def _read_metrics(file_path):
+    with open(file_path, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    assert lines[-1] == '# EOF'
+    return {name: float(value) for name, value in (line.rsplit(' ', 1) for line in lines if not line.startswith('#'))}
+
+
+def _write_message(directory, message_text):
+    message_file = os.path.join(directory, 'COMMIT_EDITMSG')
+    with open(message_file, 'w', encoding='utf-8') as file:
+        file.write(message_text)
+    return message_file
+
+
+def test_metrics_file_accumulates_between_runs():
+    with tempfile.TemporaryDirectory() as directory:
+        metrics_file = os.path.join(directory, 'linter.prom')
+
+        main(['--metrics-file', metrics_file, _write_message(directory, 'fix: Fix bug.')])
+        main(['--metrics-file', metrics_file, _write_message(directory, 'change: This is commit message without scope and body')])
+        metrics = _read_metrics(metrics_file)
+
+    assert metrics[f'{MESSAGES_PREFIX}{{result="fail"}}'] == 1
+    assert metrics[f'{MESSAGES_PREFIX}{{result="pass"}}'] == 1
+    assert metrics[f'{VIOLATIONS_PREFIX}{{rule="error_summary_length"}}'] == 1
+    assert metrics[f'{VIOLATIONS_PREFIX}{{rule="error_summary_period"}}'] == 1
+    assert metrics[f'{VIOLATIONS_PREFIX}{{rule="error_type"}}'] == 0
+    for phase in ('read', 'parse', 'checks', 'report'):
+        assert metrics[f'{DURATION_PREFIX}_count{{phase="{phase}"}}'] == 2
+        assert metrics[f'{DURATION_PREFIX}_bucket{{phase="{phase}",le="+Inf"}}'] == 2
+
+
+def test_metrics_histogram_buckets_are_cumulative():
+    metrics = LintMetrics()
+    metrics.observe_phase('read', 0.00005)
+    metrics.observe_phase('read', 0.003)
+    metrics.observe_phase('read', 5.0)
+    samples = metrics.samples()
+
+    assert samples[f'{DURATION_PREFIX}_bucket{{phase="read",le="0.0001"}}'] == 1
+    assert samples[f'{DURATION_PREFIX}_bucket{{phase="read",le="0.005"}}'] == 2
+    assert samples[f'{DURATION_PREFIX}_bucket{{phase="read",le="1.0"}}'] == 2
+    assert samples[f'{DURATION_PREFIX}_bucket{{phase="read",le="+Inf"}}'] == 3
+    assert samples[f'{DURATION_PREFIX}_sum{{phase="read"}}'] == 0.00005 + 0.003 + 5.0
+
+
+def test_metrics_file_concurrent_writers():
+    writers = 32
+    metrics = LintMetrics()
+    metrics.messages['pass'] = 1
+    metrics.observe_phase('read', 0.001)
+
+    with tempfile.TemporaryDirectory() as directory:
+        metrics_file = os.path.join(directory, 'linter.prom')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: write_metrics_file(metrics_file, metrics), range(writers)))
+        result = _read_metrics(metrics_file)
+        leftovers = [name for name in os.listdir(directory) if name not in ('linter.prom', 'linter.prom.lock')]
+
+    assert result[f'{MESSAGES_PREFIX}{{result="pass"}}'] == writers
+    assert result[f'{DURATION_PREFIX}_count{{phase="read"}}'] == writers
+    assert not leftovers
@@ -0,0 +1,190 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conventional_precommit_linter.history import CommitRecord
+from conventional_precommit_linter.pre_receive import check_pushed_commits
+from conventional_precommit_linter.pre_receive import iter_pushed_commits
+from conventional_precommit_linter.pre_receive import parse_args
+from conventional_precommit_linter.pre_receive import parse_ref_updates
+
+VALID_MESSAGE = 'change: This is commit message without scope and body'
+INVALID_MESSAGE = 'fix: Fix bug'
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture()
+def server_repo(git_repo, tmp_path, monkeypatch):
+    """Bare repository with the pre-receive hook installed, added as 'server' remote of the 'git_repo'."""
+    server_path = tmp_path / 'server.git'
+    subprocess.run(['git', 'init', '-q', '--bare', str(server_path)], check=True)
+    hook_path = server_path / 'hooks' / 'pre-receive'
+    hook_path.write_text(f'#!/bin/sh\nexec "{sys.executable}" -m conventional_precommit_linter.pre_receive --skip-merges\n')
+    hook_path.chmod(0o755)
+    monkeypatch.setenv('PYTHONPATH', PACKAGE_ROOT)
+    git_repo.git('remote', 'add', 'server', str(server_path))
+    return server_path
+
+
+def _push(*refspecs):
+    return subprocess.run(['git', 'push', '--porcelain', 'server', *refspecs], capture_output=True, text=True, check=False)
+
+
+def _record(message, sha='0' * 40, parents=('1' * 40,)):
+    return CommitRecord(sha=sha, parents=list(parents), author='A <a@example.com>', committer='A <a@example.com>', message=message)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='shell hook script')
+def test_pre_receive_hook_accepts_and_rejects_pushes(git_repo, server_repo):
+    git_repo(VALID_MESSAGE)
+    assert _push('main').returncode == 0
+
+    # Two refs sharing the same new invalid commit: it is reported once, and nothing is updated
+    invalid_sha = git_repo(INVALID_MESSAGE)
+    git_repo(VALID_MESSAGE)
+    git_repo.git('branch', 'feature')
+    push = _push('main', 'feature')
+    assert push.returncode != 0
+    assert push.stderr.count(invalid_sha[:12]) == 1
+    assert 'Push rejected: invalid commit messages.' in push.stderr
+    assert 'feature' not in subprocess.run(['git', 'branch'], cwd=server_repo, capture_output=True, text=True, check=True).stdout
+
+    # Commits already in the repository are not checked again, merge commits are skipped
+    git_repo.git('reset', '-q', '--hard', 'HEAD~2')
+    git_repo.git('checkout', '-q', '-b', 'topic')
+    git_repo(VALID_MESSAGE)
+    git_repo.git('checkout', '-q', 'main')
+    git_repo.git('merge', '-q', '--no-ff', '-m', "Merge branch 'topic'", 'topic')
+    assert _push('main', 'topic').returncode == 0
+
+    # Deleting a ref pushes no commits
+    assert _push(':topic').returncode == 0
+
+
+def test_parse_ref_updates():
+    lines = [f'{"0" * 40} {"a" * 40} refs/heads/main\n', '\n', f'{"b" * 40} {"0" * 40} refs/tags/v1.0\n']
+    assert parse_ref_updates(lines) == [('0' * 40, 'a' * 40, 'refs/heads/main'), ('b' * 40, '0' * 40, 'refs/tags/v1.0')]
+
+
+def test_time_budget_accepts_remaining_commits(capsys):
+    records = [_record(VALID_MESSAGE)] + [_record(INVALID_MESSAGE)] * 5
+
+    assert check_pushed_commits(records, parse_args(['--time-budget', '0', '--on-timeout', 'accept'])) == 0
+    assert 'remaining commits accepted without check' in capsys.readouterr().out
+
+    assert check_pushed_commits(records, parse_args(['--time-budget', '30', '--on-timeout', 'accept'])) == 1
+    assert 'WARNING' not in capsys.readouterr().out
+
+
+class _SlowPush:
+    """Pushed commits streamed one per second of a fake clock; the commit at 'invalid_index' has an invalid message."""
+
+    def __init__(self, monkeypatch, count, invalid_index):
+        self.clock = 0.0
+        self.count = count
+        self.invalid_index = invalid_index
+        self.read_commits = 0
+        monkeypatch.setattr('conventional_precommit_linter.pre_receive.time.monotonic', lambda: self.clock)
+
+    def __iter__(self):
+        for index in range(self.count):
+            self.clock += 1
+            self.read_commits += 1
+            yield _record(INVALID_MESSAGE if index == self.invalid_index else VALID_MESSAGE, sha=f'{index:012x}' + '0' * 28)
+
+
+def test_time_budget_samples_remaining_commits(monkeypatch, capsys):
+    # Commits 0-4 are checked in the first half of the budget, commits 5-7 are all in the sample
+    push = _SlowPush(monkeypatch, count=8, invalid_index=7)
+    assert check_pushed_commits(push, parse_args(['--time-budget', '10', '--timeout-sample', '50'])) == 1
+    output = capsys.readouterr().out
+    assert 'WARNING' not in output
+    assert f'{7:012x}' in output
+
+
+@pytest.mark.parametrize('seed, invalid_commit_sampled', [(0, False), (1, True)])  # seed 0 samples commits 7 and 9, seed 1 commits 6 and 8
+def test_time_budget_sample_is_reproducible(monkeypatch, capsys, seed, invalid_commit_sampled):
+    # Commits 5-9 are read in the second half of the budget, 2 of them are checked
+    push = _SlowPush(monkeypatch, count=10, invalid_index=8)
+    assert check_pushed_commits(push, parse_args(['--time-budget', '10', '--timeout-sample', '2', '--sample-seed', str(seed)])) == int(invalid_commit_sampled)
+    output = capsys.readouterr().out
+    assert 'checked a random sample of the remaining commits' in output
+    assert (f'{8:012x}' in output) is invalid_commit_sampled
+
+
+def test_time_budget_bounds_sampling(monkeypatch, capsys):
+    # Commits after the 10th are never read: the walk stops with the time budget
+    push = _SlowPush(monkeypatch, count=1000, invalid_index=500)
+    assert check_pushed_commits(push, parse_args(['--time-budget', '10', '--timeout-sample', '3'])) == 0
+    assert push.read_commits == 11  # one more commit is read to find out the push is not fully checked
+    assert 'checked a random sample of 3 of the next 5 commits, remaining commits accepted without check' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('on_timeout', ['sample', 'accept'])
+def test_time_budget_with_slow_commit_stream(on_timeout, capsys):
+    def slow_push():
+        for index in range(300):
+            time.sleep(0.01)
+            yield _record(INVALID_MESSAGE if index == 299 else VALID_MESSAGE, sha=f'{index:040x}')
+
+    started = time.monotonic()
+    assert check_pushed_commits(slow_push(), parse_args(['--time-budget', '0.2', '--on-timeout', on_timeout])) == 0
+    assert time.monotonic() - started < 0.6  # reading all commits takes 3 seconds
+    assert 'remaining commits accepted without check' in capsys.readouterr().out
+
+
+def _fake_git(tmp_path, monkeypatch, script):
+    """Put a 'git' stand-in running the python 'script' first on the PATH."""
+    bin_path = tmp_path / 'bin'
+    bin_path.mkdir()
+    git_path = bin_path / 'git'
+    git_path.write_text(f'#!{sys.executable}\nimport sys\nimport time\nsys.stdin.read()\n{script}\n')
+    git_path.chmod(0o755)
+    monkeypatch.setenv('PATH', f'{bin_path}{os.pathsep}{os.environ["PATH"]}')
+
+
+def _check_push(args):
+    pushed_commits = iter_pushed_commits([('0' * 40, 'a' * 40, 'refs/heads/main')], timeout=args.time_budget)
+    try:
+        return check_pushed_commits(pushed_commits, args)
+    finally:
+        pushed_commits.close()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='executable git stand-in script')
+@pytest.mark.parametrize('on_timeout', ['sample', 'accept'])
+def test_time_budget_covers_git_walk(tmp_path, monkeypatch, capsys, on_timeout):
+    # Like git's limited walk of a huge push: nothing is listed before the whole walk is computed
+    _fake_git(tmp_path, monkeypatch, 'time.sleep(30)')
+
+    started = time.monotonic()
+    assert _check_push(parse_args(['--time-budget', '0.5', '--on-timeout', on_timeout])) == 0
+    assert time.monotonic() - started < 2
+    assert 'exceeded its time budget of 0.5s, remaining commits accepted without check' in capsys.readouterr().out
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='executable git stand-in script')
+def test_time_budget_checks_commits_listed_before_git_is_killed(tmp_path, monkeypatch, capsys):
+    records = [('1' * 40, INVALID_MESSAGE), ('2' * 40, VALID_MESSAGE), ('3' * 40, VALID_MESSAGE)]
+    listed = '\0'.join('\x1f'.join((sha, 'f' * 40, 'A <a@example.com>', 'A <a@example.com>', message)) for sha, message in records)
+    _fake_git(tmp_path, monkeypatch, f'sys.stdout.write({listed!r})\nsys.stdout.flush()\ntime.sleep(30)')
+
+    started = time.monotonic()
+    assert _check_push(parse_args(['--time-budget', '0.5'])) == 1
+    assert time.monotonic() - started < 2
+    output = capsys.readouterr().out
+    assert '111111111111 fix: Fix bug' in output
+    assert 'remaining commits accepted without check' in output
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='executable git stand-in script')
+def test_git_failure_accepts_push(tmp_path, monkeypatch, capsys):
+    _fake_git(tmp_path, monkeypatch, "sys.stderr.write('fatal: bad object ' + 'a' * 40)\nsys.exit(128)")
+
+    assert _check_push(parse_args([])) == 0
+    output = capsys.readouterr().out
+    assert f'WARNING: listing the pushed commits failed: fatal: bad object {"a" * 40}' in output
+    assert 'remaining commits accepted without check' in output
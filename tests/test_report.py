@@ -0,0 +1,49 @@
+import pytest
+
+from conventional_precommit_linter.hook import get_report_template
+from conventional_precommit_linter.hook import lint_commit_message
+from conventional_precommit_linter.hook import main
+from conventional_precommit_linter.hook import parse_args
+from conventional_precommit_linter.hook import render_report
+
+
+@pytest.mark.parametrize(
+    'argv, rule, enabled',
+    [
+        ([], 'error_breaking', True),
+        (['--allow-breaking'], 'error_breaking', False),
+        ([], 'error_scope_allowed', False),
+        (['--scopes=bootloader,rom'], 'error_scope_allowed', True),
+        ([], 'error_summary_capitalization', False),
+        (['--summary-uppercase'], 'error_summary_capitalization', True),
+    ],
+)
+def test_template_lists_configured_rules(argv, rule, enabled):
+    template = get_report_template(parse_args(['COMMIT_EDITMSG', *argv]))
+    assert (rule in dict(template.rule_lines)) is enabled
+
+
+def test_template_is_built_once_per_configuration():
+    assert get_report_template(parse_args(['COMMIT_EDITMSG', '--types=feat,fix'])) is get_report_template(parse_args(['COMMIT_EDITMSG', '--types=feat,fix']))
+    assert get_report_template(parse_args(['COMMIT_EDITMSG', '--types=feat,fix'])) is not get_report_template(parse_args(['COMMIT_EDITMSG', '--types=feat']))
+
+
+def test_report_contains_title_and_failed_rule():
+    args = parse_args(['COMMIT_EDITMSG', '--scopes=bootloader,rom'])
+    report = render_report(lint_commit_message('feat(efuse)!: Add new efuse API.', args), args)
+
+    assert 'efuse' in report
+    assert report.count('FAIL:') == 4  # breaking change, scope not allowed, summary period and length
+    assert 'must be one of the following allowed scopes' in report
+    assert report.endswith('\n\n')
+
+
+def test_report_written_in_single_write(tmp_path, monkeypatch):
+    message_file = tmp_path / 'COMMIT_EDITMSG'
+    message_file.write_text('change(rom): Fixed the another bug.')
+    writes = []
+    monkeypatch.setattr('sys.stdout.write', writes.append)
+
+    assert main([str(message_file)]) == 1
+    assert len(writes) == 1
+    assert 'INVALID COMMIT MESSAGE' in writes[0]